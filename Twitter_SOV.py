@@ -1,7 +1,9 @@
 """Third Party Imports."""
+import os
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
+from dashboard_data import (
+    display_trend_section, live_mode_enabled, load_dataset, show_startup_report, start_warm_up, timed
+)
 
 # Constants for file paths
 CSV_PATHS = {
@@ -9,18 +11,78 @@ CSV_PATHS = {
     "axie_vs_field": 'csvs/SOV - Twitter_axie_vs_field.csv',
     "ronin_vs_field": 'csvs/SOV - Ronin_vs_field.csv',
     "ronin_games": 'csvs/SOV - Twitter_ronin_games.csv',
-    "ronin_games_vs_field": 'csvs/SOV - Twitter_RVF.csv'
+    "ronin_games_vs_field": 'csvs/SOV - Twitter_RVF.csv',
+    "unique_reach": 'csvs/SOV - Twitter_unique_reach.csv'
 }
 
+# Windows of the exported unique reach figures, and the row holding the cross-game total
+REACH_WINDOWS = ['7d', '30d', '90d']
+ALL_GAMES = "All Games"
+
+# Dashboard sections in page order: (subheader, kind, CSV key)
+SECTIONS = [
+    ("Axie Infinity Trend", "trend", "main_data"),
+    ("Unique Reach", "reach", "unique_reach"),
+    ("Axie Infinity vs Field", "comparison", "axie_vs_field"),
+    ("Ronin Network vs Other Chains", "comparison", "ronin_vs_field"),
+    ("Ronin Games vs Each Other", "comparison", "ronin_games"),
+    ("Ronin Games vs Field", "comparison", "ronin_games_vs_field"),
+]
+METRICS_OPTIONS = ['Tweet', 'Retweet Count', 'Likes Count']
+
 # Data Loading Functions
 def read_data(filename):
-    """Read data from CSV and ensure 'Date' column is in datetime format if present."""
-    df = pd.read_csv(filename)
-    if 'Date' in df.columns:
-        df['Date'] = pd.to_datetime(df['Date'])
-    return df
+    """Read data from the shared dataset cache, with the 'Date' column parsed as datetime if present."""
+    return load_dataset(filename)
+
+def read_unique_reach(window):
+    """Read unique reach per game for a window, or None if no reach figures have been exported."""
+    if not os.path.exists(CSV_PATHS["unique_reach"]):
+        return None
+    reach = read_data(CSV_PATHS["unique_reach"])
+    return reach[['Game', f'Unique Reach {window}']].rename(columns={f'Unique Reach {window}': 'Unique Reach'})
+
+def add_unique_reach(data, metrics_options, reach):
+    """
+    Add a 'Unique Reach' metric to comparison data for the games that are tracked.
+
+    Games outside the collected game list have no reach figure; their
+    'Unique Reach' is left missing rather than counted as zero.
+
+    Returns:
+        tuple: (comparison data, metric options, list of untracked games).
+    """
+    if reach is None:
+        return data, metrics_options, []
+    untracked = data.loc[~data['Game'].isin(reach['Game']), 'Game'].tolist()
+    if len(untracked) == len(data):
+        return data, metrics_options, untracked
+    return data.merge(reach, on='Game', how='left'), metrics_options + ['Unique Reach'], untracked
+
+def reach_total(reach):
+    """Return the cross-game unique reach, or None if it was not exported."""
+    total = reach.loc[reach['Game'] == ALL_GAMES, 'Unique Reach']
+    return None if total.empty else int(total.iloc[0])
+
+def untracked_note(untracked):
+    """Describe the games whose unique reach is not collected."""
+    return f"Unique reach is not collected for: {', '.join(untracked)}. Its shares cover the other games only."
 
 # Chart Generation Functions
+def line_chart_figure(chart_data, selected_columns):
+    """Build a line chart figure for the given metrics over a Date-indexed frame."""
+    import plotly.graph_objects as go  # Deferred until a chart is actually drawn
+    fig = go.Figure()
+    for column in selected_columns:
+        fig.add_trace(go.Scatter(x=chart_data.index, y=chart_data[column], mode='lines', name=column))
+    fig.update_layout(
+        title="Twitter Share of Voice",
+        xaxis_title="Date",
+        yaxis_title="Count",
+        xaxis=dict(tickformat='%m-%d')  # Format x-axis ticks to display month-day
+    )
+    return fig
+
 def generate_line_chart(data, metric_columns):
     """Generate a line chart for selected metrics over time."""
     chart_data = data.set_index('Date')  # Set 'Date' column as index
@@ -29,36 +91,34 @@ def generate_line_chart(data, metric_columns):
     selected_columns = [option for option in options if option in chart_data.columns]
 
     if selected_columns:
-        fig = go.Figure()
-        for column in selected_columns:
-            fig.add_trace(go.Scatter(x=chart_data.index, y=chart_data[column], mode='lines', name=column))
-        fig.update_layout(
-            title="Twitter Share of Voice",
-            xaxis_title="Date",
-            yaxis_title="Count",
-            xaxis=dict(tickformat='%m-%d')  # Format x-axis ticks to display month-day
-        )
-        st.plotly_chart(fig)
+        st.plotly_chart(line_chart_figure(chart_data, selected_columns))
     else:
         st.write("Please select at least one count to display.")
 
-def generate_pie_chart(data, options, widget_id, chart_title):
-    """Generate pie chart for selected metrics."""
-    selected_options = st.multiselect(widget_id, options, default=options, key=f"pie_chart_{widget_id}")
+def pie_chart_figure(data, selected_options, chart_title):
+    """Build a pie chart figure for the given metrics."""
+    import plotly.graph_objects as go
     fig = go.Figure()
 
     for option in selected_options:
+        # Games without a value for a metric (e.g. untracked reach) are left out, not shown as zero
+        present = data[data[option].notna()]
         fig.add_trace(go.Pie(
-            labels=data['Game'], values=data[option],
+            labels=present['Game'], values=present[option],
             name=option, textinfo='label+percent', textposition='inside'
         ))
     fig.update_layout(title=chart_title)
-    st.plotly_chart(fig)
+    return fig
 
-def generate_bar_chart(data, options, widget_id, chart_title="Bar Chart of Metrics"):
-    """Generate a stacked bar chart of selected metrics."""
-    selected_options = st.multiselect(widget_id, options, default=options, key=f"bar_chart_{widget_id}")
-    grouped_data = data.groupby('Game')[selected_options].sum().reset_index()
+def generate_pie_chart(data, options, widget_id, chart_title):
+    """Generate pie chart for selected metrics."""
+    selected_options = st.multiselect(widget_id, options, default=options, key=f"pie_chart_{widget_id}")
+    st.plotly_chart(pie_chart_figure(data, selected_options, chart_title))
+
+def bar_chart_figure(data, selected_options, chart_title="Bar Chart of Metrics"):
+    """Build a stacked bar chart figure of the given metrics."""
+    import plotly.graph_objects as go
+    grouped_data = data.groupby('Game')[selected_options].sum(min_count=1).reset_index()
     grouped_data['Total'] = grouped_data[selected_options].sum(axis=1)
     sorted_data = grouped_data.sort_values(by='Total', ascending=True)
     
@@ -73,41 +133,86 @@ def generate_bar_chart(data, options, widget_id, chart_title="Bar Chart of Metri
         yaxis_title='Game',
         barmode='stack'
     )
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
+
+def generate_bar_chart(data, options, widget_id, chart_title="Bar Chart of Metrics"):
+    """Generate a stacked bar chart of selected metrics."""
+    selected_options = st.multiselect(widget_id, options, default=options, key=f"bar_chart_{widget_id}")
+    st.plotly_chart(bar_chart_figure(data, selected_options, chart_title), use_container_width=True)
 
 
 # Main Dashboard UI
 def display_dashboard():
     """Displays the main dashboard with interactive visualizations."""
     st.title("Twitter Share of Voice Analysis")
-
-    # Define metrics options for charts
-    metrics_options = ['Tweet', 'Retweet Count', 'Likes Count']
-
-    # Load and display main trend data for Axie Infinity
-    st.subheader("Axie Infinity Trend")
-    main_data = read_data(CSV_PATHS["main_data"])
-    generate_line_chart(main_data, metrics_options)
-
-    # Display Axie Infinity vs Field charts
-    display_comparison_charts("Axie Infinity vs Field", CSV_PATHS["axie_vs_field"], metrics_options)
-
-    # Display Ronin Network vs Other Chains charts
-    display_comparison_charts("Ronin Network vs Other Chains", CSV_PATHS["ronin_vs_field"], metrics_options)
-
-    # Display Ronin Games vs Each Other charts
-    display_comparison_charts("Ronin Games vs Each Other", CSV_PATHS["ronin_games"], metrics_options)
-
-    # Display Ronin Games vs Field charts
-    display_comparison_charts("Ronin Games vs Field", CSV_PATHS["ronin_games_vs_field"], metrics_options)
-
-def display_comparison_charts(title, data_path, metrics_options):
+    live = live_mode_enabled()
+
+    reach = None
+    for title, kind, key in SECTIONS:
+        # Unique reach only appears once sketches have been exported
+        if kind == "reach" and not os.path.exists(CSV_PATHS[key]):
+            continue
+        st.subheader(title)
+        if kind == "trend":
+            display_trend_section(
+                CSV_PATHS[key], lambda data: generate_line_chart(data, METRICS_OPTIONS), live
+            )
+        elif kind == "reach":
+            window = st.sidebar.selectbox("Unique reach window", REACH_WINDOWS, key="reach_window")
+            reach = read_unique_reach(window)
+            total = reach_total(reach)
+            if total is not None:
+                st.metric(f"Unique authors across all games ({window})", f"{total:,}")
+        else:
+            display_comparison_charts(title, CSV_PATHS[key], METRICS_OPTIONS, reach)
+
+def display_comparison_charts(title, data_path, metrics_options, reach=None):
     """Helper function to display pie and bar charts for comparison data."""
-    st.subheader(title)
-    comparison_data = read_data(data_path)
+    comparison_data, metrics_options, untracked = add_unique_reach(read_data(data_path), metrics_options, reach)
+    if untracked:
+        st.caption(untracked_note(untracked))
     generate_pie_chart(comparison_data, metrics_options, f'Select {title} metrics', f'{title} Pie Chart')
     generate_bar_chart(comparison_data, metrics_options, f'Select {title} metrics', f'{title} Bar Chart')
 
+# Static Snapshot
+def reach_total_figure(total, window):
+    """Build an indicator figure of the cross-game unique reach."""
+    import plotly.graph_objects as go
+    return go.Figure(go.Indicator(
+        mode='number', value=total, title=dict(text=f"Unique authors across all games ({window})")
+    ))
+
+def snapshot_figures():
+    """Build every figure of the dashboard with its default selections, in page order."""
+    figures = []
+    window = REACH_WINDOWS[0]
+    reach = None
+    for title, kind, key in SECTIONS:
+        if kind == "reach" and not os.path.exists(CSV_PATHS[key]):
+            continue
+        if kind == "trend":
+            main_data = read_data(CSV_PATHS[key]).set_index('Date')
+            selected_columns = [option for option in METRICS_OPTIONS if option in main_data.columns]
+            figures.append((title, line_chart_figure(main_data, selected_columns)))
+        elif kind == "reach":
+            reach = read_unique_reach(window)
+            total = reach_total(reach)
+            if total is not None:
+                figures.append((title, reach_total_figure(total, window)))
+        else:
+            comparison_data, comparison_options, untracked = add_unique_reach(
+                read_data(CSV_PATHS[key]), METRICS_OPTIONS, reach
+            )
+            pie_title = f'{title} Pie Chart'
+            if untracked:
+                pie_title += f'<br><sup>{untracked_note(untracked)}</sup>'
+            figures.append((title, pie_chart_figure(comparison_data, comparison_options, pie_title)))
+            figures.append((title, bar_chart_figure(comparison_data, comparison_options, f'{title} Bar Chart')))
+    return figures
+
 # Run main dashboard function
 if __name__ == '__main__':
-    display_dashboard()
+    start_warm_up()
+    with timed("First render of Twitter page"):
+        display_dashboard()
+    show_startup_report()
@@ -0,0 +1,112 @@
+"""Render the dashboards with default selections into static HTML/JSON bundles.
+
+Run from the repository root after each data refresh:
+
+    python build_snapshots.py
+
+Each page is written to ``snapshots/<page>/`` as a self-contained
+``index.html`` (Plotly.js inlined once) and a ``figures.json`` with the
+figure specs, so read-only viewers can be served by any static file server
+without a Python session per request.
+"""
+import argparse
+import html
+import importlib.util
+import json
+import os
+
+import plotly.io as pio
+
+# Dashboard pages to snapshot: output name -> (script path, page title)
+PAGES = {
+    "twitter": ("Twitter_SOV.py", "Twitter Share of Voice Analysis"),
+    "twitch": ("pages/_Twitch_SOV.py", "Twitch Share of Voice Analysis"),
+    "youtube": ("pages/_Youtube_SOV.py", "YouTube Share of Voice Analysis"),
+}
+
+
+def load_page(name, path):
+    """
+    Import a dashboard page script as a module without running its UI.
+
+    Args:
+        name (str): Module name to register the page under.
+        path (str): Path to the page script.
+
+    Returns:
+        module: The imported page module.
+    """
+    spec = importlib.util.spec_from_file_location(f"snapshot_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def render_html(title, figures):
+    """
+    Render a list of (section, figure) pairs into a single self-contained HTML page.
+
+    Args:
+        title (str): Page title.
+        figures (list): ``(section title, plotly Figure)`` tuples in page order.
+
+    Returns:
+        str: Complete HTML document.
+    """
+    parts = [
+        "<!DOCTYPE html>",
+        "<html><head><meta charset='utf-8'>",
+        f"<title>{html.escape(title)}</title>",
+        "</head><body>",
+        f"<h1>{html.escape(title)}</h1>",
+    ]
+    current_section = None
+    for i, (section, fig) in enumerate(figures):
+        if section != current_section:
+            parts.append(f"<h2>{html.escape(section)}</h2>")
+            current_section = section
+        # Inline Plotly.js with the first figure only
+        parts.append(pio.to_html(fig, full_html=False, include_plotlyjs=(i == 0)))
+    parts.append("</body></html>")
+    return "\n".join(parts)
+
+
+def write_atomic(path, content):
+    """Write a file via a temporary name so servers never see a partial file."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        file.write(content)
+    os.replace(tmp_path, path)
+
+
+def build_snapshots(output_dir="snapshots", pages=None):
+    """
+    Build the static bundle of every dashboard page.
+
+    Args:
+        output_dir (str): Directory to write the bundles into.
+        pages (list): Page names to build; all pages if None.
+    """
+    for name in pages or PAGES:
+        path, title = PAGES[name]
+        page = load_page(name, path)
+        figures = page.snapshot_figures()
+
+        page_dir = os.path.join(output_dir, name)
+        os.makedirs(page_dir, exist_ok=True)
+        write_atomic(os.path.join(page_dir, "index.html"), render_html(title, figures))
+        write_atomic(os.path.join(page_dir, "figures.json"), json.dumps(
+            [{"section": section, "figure": json.loads(pio.to_json(fig))} for section, fig in figures]
+        ))
+        print(f"Snapshot of '{name}' saved to {page_dir} ({len(figures)} figures)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build static snapshots of the dashboards.")
+    parser.add_argument("--output-dir", default="snapshots", help="directory to write the bundles into")
+    parser.add_argument("pages", nargs="*", help=f"pages to build: {', '.join(PAGES)} (default: all)")
+    args = parser.parse_args()
+    unknown = [name for name in args.pages if name not in PAGES]
+    if unknown:
+        parser.error(f"unknown page(s): {', '.join(unknown)}")
+    build_snapshots(args.output_dir, args.pages)
@@ -0,0 +1,649 @@
+"""Third Party Imports."""
+import glob
+import hashlib
+import io
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+import streamlit as st
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+# Startup timing report: label -> seconds, first occurrence of each step only.
+# Importing streamlit and pandas is not timed: the streamlit server has loaded
+# both before any page script runs, so the cost is not visible from here.
+STARTUP_TIMINGS = {}
+_timings_lock = threading.Lock()
+
+# Dataset files loaded into the shared cache by the warm-up
+WARM_UP_GLOB = 'csvs/*.csv'
+
+# Directory of published Arrow copies of the datasets, memory-mapped by every worker process
+DATASETS_DIR = 'datasets'
+
+# Seconds between refreshes of the trend charts in live mode
+LIVE_REFRESH_SECONDS = 30
+
+# Bytes hashed at the start of a tailed file and before its read offset to detect rewrites
+REWRITE_CHECK_BYTES = 4096
+
+# Trend resolutions and their pandas resample rules (None keeps the raw rows);
+# bins are closed and labelled on the left, so each label is the first day of its bin
+RESOLUTIONS = {"Day": None, "Week": "W", "Month": "MS"}
+
+
+class CsvTail:
+    """
+    Incrementally loaded view of an append-only CSV file.
+
+    The byte offset of the last complete line read is remembered, so each poll
+    parses only the rows appended since the previous one. Appended rows are
+    kept as separate chunks and only concatenated when the whole frame is
+    asked for. A file that shrinks, is replaced or is rewritten in place is
+    reloaded from the start, which starts a new generation. Rewrites are
+    detected from the modification time: a changed file is only read as
+    appended if it grew and its first block and the block before the read
+    offset are unchanged. On a load from the start the end of the file also
+    ends a line, so a last row without a trailing newline is kept; the file
+    is then reloaded whole if it changes again.
+
+    Args:
+        path (str): Path to the CSV file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.chunks = []
+        self.rows = 0
+        self.columns = None
+        self.offset = 0
+        self.inode = None
+        self.mtime_ns = None
+        self.fingerprint = None
+        self.version = 0
+        self.generation = 0
+        self.partial = False  # whether the last row read had no trailing newline
+        self._lock = threading.Lock()
+
+    def _parse(self, chunk, header):
+        """Parse a chunk of complete CSV lines and convert the 'Date' column."""
+        if header:
+            df = pd.read_csv(io.BytesIO(chunk))
+        else:
+            df = pd.read_csv(io.BytesIO(chunk), header=None, names=self.columns)
+        if 'Date' in df.columns:
+            df['Date'] = pd.to_datetime(df['Date'])
+        return df
+
+    def _read_from(self, offset, size, to_eof=False):
+        """Read complete lines between offset and size, returning the bytes consumed."""
+        with open(self.path, 'rb') as file:
+            file.seek(offset)
+            chunk = file.read(size - offset)
+        if to_eof:
+            return chunk
+        end = chunk.rfind(b'\n')
+        return chunk[:end + 1] if end >= 0 else b''
+
+    def _fingerprint(self, offset):
+        """Hash the first block of the file and the block ending at offset."""
+        anchor_start = max(offset - REWRITE_CHECK_BYTES, 0)
+        with open(self.path, 'rb') as file:
+            head = file.read(min(REWRITE_CHECK_BYTES, offset))
+            file.seek(anchor_start)
+            anchor = file.read(offset - anchor_start)
+        return hashlib.blake2b(head + b'\0' + anchor, digest_size=16).digest()
+
+    def _appended_only(self, stat):
+        """Return True if a changed file can be read as the old contents plus appended rows."""
+        if stat.st_mtime_ns == self.mtime_ns:
+            return True
+        # Appending always grows a file, so an unchanged size means it was rewritten
+        return stat.st_size > self.offset and self._fingerprint(self.offset) == self.fingerprint
+
+    def _concat(self):
+        """Concatenate the pending chunks into one frame, once per change."""
+        if len(self.chunks) > 1:
+            self.chunks = [pd.concat(self.chunks, ignore_index=True)]
+        return self.chunks[0]
+
+    @property
+    def frame(self):
+        """All rows read so far, or None before the first poll."""
+        with self._lock:
+            return self._concat() if self.chunks else None
+
+    def read_since(self, generation, rows):
+        """
+        Return the rows added after an earlier read.
+
+        Args:
+            generation (int): Generation of the earlier read.
+            rows (int): Number of rows seen by the earlier read.
+
+        Returns:
+            tuple: (generation, row count, frame, appended). If the file was
+            not reloaded since, ``frame`` holds only the new rows and
+            ``appended`` is True; otherwise it holds every row.
+        """
+        with self._lock:
+            if generation != self.generation or rows > self.rows:
+                return self.generation, self.rows, self._concat(), False
+            pieces, first = [], self.rows
+            for chunk in reversed(self.chunks):
+                if first <= rows:
+                    break
+                first -= len(chunk)
+                pieces.append(chunk.iloc[max(rows - first, 0):])
+            new_rows = pd.concat(pieces[::-1], ignore_index=True) if pieces else self.chunks[0].iloc[:0]
+            return self.generation, self.rows, new_rows, True
+
+    def poll(self):
+        """
+        Pick up rows appended since the last poll.
+
+        Returns:
+            bool: True if the frame changed.
+        """
+        with self._lock:
+            stat = os.stat(self.path)
+            if (not self.chunks or stat.st_ino != self.inode or stat.st_size < self.offset
+                    or (self.partial and stat.st_size != self.offset) or not self._appended_only(stat)):
+                chunk = self._read_from(0, stat.st_size, to_eof=True)
+                frame = self._parse(chunk, header=True)
+                self.chunks = [frame]
+                self.rows = len(frame)
+                self.columns = list(frame.columns)
+                self.offset = len(chunk)
+                self.inode = stat.st_ino
+                self.mtime_ns = stat.st_mtime_ns
+                self.fingerprint = self._fingerprint(self.offset)
+                self.partial = bool(chunk) and not chunk.endswith(b'\n')
+                self.generation += 1
+                self.version += 1
+                return True
+
+            if stat.st_size == self.offset:
+                return False
+
+            chunk = self._read_from(self.offset, stat.st_size)
+            if not chunk:
+                return False  # Only a partially written line so far
+            new_rows = self._parse(chunk, header=False)
+            self.chunks.append(new_rows)
+            self.rows += len(new_rows)
+            self.offset += len(chunk)
+            self.mtime_ns = stat.st_mtime_ns
+            self.fingerprint = self._fingerprint(self.offset)
+            self.version += 1
+            return True
+
+
+@st.cache_resource
+def get_tail(path):
+    """Return the process-wide CsvTail for a data file."""
+    return CsvTail(path)
+
+
+def published_path(csv_path, datasets_dir=DATASETS_DIR):
+    """Return the path of the published Arrow file for a CSV dataset."""
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(datasets_dir, f"{name}.arrow")
+
+
+def read_csv_dataset(path):
+    """Read a whole CSV dataset, parsing the 'Date' column if present."""
+    df = pd.read_csv(path)
+    if 'Date' in df.columns:
+        df['Date'] = pd.to_datetime(df['Date'])
+    return df
+
+
+@st.cache_resource(max_entries=64)
+def _read_csv_version(path, inode, mtime_ns, size):
+    """Read one version of a CSV dataset."""
+    return read_csv_dataset(path)
+
+
+def publish_dataset(csv_path, datasets_dir=DATASETS_DIR):
+    """
+    Publish a CSV dataset as an uncompressed Arrow IPC (Feather v2) file.
+
+    The file is written under a temporary name and moved into place with an
+    atomic rename, so readers see either the old or the new version. Workers
+    that still map the old file keep reading it until they pick up the new one.
+
+    Args:
+        csv_path (str): Path to the CSV dataset.
+        datasets_dir (str): Directory to publish into.
+
+    Returns:
+        str: Path of the published file.
+    """
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    df = read_csv_dataset(csv_path)
+
+    os.makedirs(datasets_dir, exist_ok=True)
+    target = published_path(csv_path, datasets_dir)
+    tmp_path = f"{target}.{os.getpid()}.tmp"
+    # Uncompressed so the buffers can be memory-mapped without decoding
+    feather.write_feather(pa.Table.from_pandas(df, preserve_index=False), tmp_path, compression='uncompressed')
+    os.replace(tmp_path, target)
+    return target
+
+
+@st.cache_resource(max_entries=64)
+def _map_published(arrow_path, inode, mtime_ns):
+    """Memory-map one version of a published Arrow file as a DataFrame."""
+    import pyarrow as pa
+
+    with pa.memory_map(arrow_path, 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+    # Numeric and datetime columns without nulls stay views over the mapped pages
+    return table.to_pandas(split_blocks=True)
+
+
+def load_published(path):
+    """
+    Memory-map the published Arrow copy of a dataset, if it is up to date.
+
+    A CSV written after its Arrow copy was published takes precedence, so
+    datasets refreshed without re-running ``publish_datasets.py`` are not
+    silently ignored.
+
+    Args:
+        path (str): Path to the CSV file.
+
+    Returns:
+        tuple: (version key, pd.DataFrame), or None if the dataset is not
+        published or the CSV is newer than its published copy.
+    """
+    arrow_path = published_path(path)
+    try:
+        stat = os.stat(arrow_path)
+    except FileNotFoundError:
+        return None
+    try:
+        if os.stat(path).st_mtime_ns > stat.st_mtime_ns:
+            return None
+    except FileNotFoundError:
+        pass
+    return ('arrow', stat.st_ino, stat.st_mtime_ns), _map_published(arrow_path, stat.st_ino, stat.st_mtime_ns)
+
+
+def load_dataset_version(path):
+    """
+    Return a dataset together with a version key that changes whenever its data does.
+
+    An up-to-date published Arrow copy is memory-mapped when one exists, so
+    all worker processes share a single page-cached copy; otherwise the CSV
+    is read whole, and read again whenever its inode, modification time or
+    size changes, so files rewritten in place are always picked up.
+
+    Args:
+        path (str): Path to the CSV file.
+
+    Returns:
+        tuple: (version key, pd.DataFrame).
+    """
+    published = load_published(path)
+    if published is not None:
+        return published
+
+    stat = os.stat(path)
+    version = ('csv', stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    return version, _read_csv_version(path, *version[1:])
+
+
+def load_dataset(path):
+    """
+    Return a dataset from the process-wide cache, picking up any new data.
+
+    The returned frame is shared between sessions and must not be modified.
+
+    Args:
+        path (str): Path to the CSV file.
+
+    Returns:
+        pd.DataFrame: Dataset with the 'Date' column parsed as datetime if present.
+    """
+    return load_dataset_version(path)[1]
+
+
+@contextmanager
+def timed(label):
+    """Record how long a startup step takes, keeping only its first occurrence."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        with _timings_lock:
+            STARTUP_TIMINGS.setdefault(label, time.perf_counter() - start)
+
+
+@st.cache_resource
+def _warm_up():
+    """Pre-import plotly and load every dataset into the shared cache, once per process."""
+    def run():
+        with timed("Warm-up total"):
+            with timed("Import plotly"):
+                import plotly.express  # noqa: F401
+                import plotly.graph_objects  # noqa: F401
+            for path in sorted(glob.glob(WARM_UP_GLOB)):
+                with timed(f"Load {os.path.basename(path)}"):
+                    load_dataset(path)
+        print(format_startup_report())
+
+    thread = threading.Thread(target=run, name="dashboard-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def start_warm_up():
+    """
+    Start the background warm-up if it has not run in this process yet.
+
+    Streamlit has no server-boot hook, so the warm-up starts on the first
+    script run and proceeds while that page renders; every later page and
+    session then finds its datasets parsed and plotly imported.
+    """
+    _warm_up()
+
+
+def format_startup_report():
+    """Format the recorded startup timings, slowest first."""
+    with _timings_lock:
+        timings = sorted(STARTUP_TIMINGS.items(), key=lambda item: item[1], reverse=True)
+    lines = ["Startup timings:"]
+    lines.extend(f"  {seconds * 1000:9.1f} ms  {label}" for label, seconds in timings)
+    return "\n".join(lines)
+
+
+def show_startup_report():
+    """Show the startup timing report in the sidebar when the page URL has ?timings."""
+    if "timings" in st.query_params:
+        with _timings_lock:
+            timings = dict(STARTUP_TIMINGS)
+        report = pd.DataFrame(
+            {"Step": list(timings), "ms": [seconds * 1000 for seconds in timings.values()]}
+        ).sort_values("ms", ascending=False)
+        st.sidebar.subheader("Startup timings")
+        st.sidebar.dataframe(report, hide_index=True)
+
+
+def column_aggregation(column):
+    """Pick how a metric column is combined when resampling to a coarser resolution."""
+    if column.startswith(("SoV_", "Average")):
+        return "mean"
+    if column.startswith("Peak"):
+        return "max"
+    return "sum"
+
+
+def resample_trend(indexed, rule):
+    """
+    Resample trend data with a sorted DatetimeIndex to a coarser resolution.
+
+    Args:
+        indexed (pd.DataFrame): Trend data with a sorted DatetimeIndex.
+        rule (str): Pandas resample rule.
+
+    Returns:
+        pd.DataFrame: One row per bin that holds data, labelled by the bin's first day.
+    """
+    numeric = indexed.select_dtypes('number')
+    resampler = numeric.resample(rule, closed='left', label='left')
+    resampled = resampler.agg({column: column_aggregation(column) for column in numeric.columns})
+    # Dates are irregular; a bin without rows has no data rather than zero activity
+    return resampled[resampler.size() > 0]
+
+
+def _collapse(chunks):
+    """Concatenate a list of frames in place into a single frame and return it."""
+    if len(chunks) > 1:
+        chunks[:] = [pd.concat(chunks)]
+    return chunks[0]
+
+
+class TrendCache:
+    """
+    Sorted and resampled views of one trend data file, shared by all sessions.
+
+    Rows appended to a tailed CSV are kept as separate date-sorted chunks, and
+    the resampled views as chunks of bins. An update sorts only the new rows
+    and re-aggregates only the bins from the one holding the earliest new row
+    onwards, reading just the rows those bins cover. The chunks are
+    concatenated when a chart reads a view. Rows that arrive out of date
+    order, and any other change to the data, rebuild the views.
+    """
+
+    def __init__(self):
+        self.version = None
+        self.generation = None
+        self.rows = 0
+        self._chunks = []
+        self._resampled = {}
+        self._lock = threading.Lock()
+
+    def _rebuild(self, indexed, rows):
+        """Build the views from the whole dataset with a sorted DatetimeIndex."""
+        self._chunks = [indexed]
+        self.rows = rows
+        self._resampled = {}
+
+    def _rows_from(self, cutoff):
+        """Return the indexed rows dated at or after cutoff, touching only the chunks that hold them."""
+        pieces = []
+        for chunk in reversed(self._chunks):
+            if len(chunk) and chunk.index[-1] < cutoff:
+                break
+            pieces.append(chunk.iloc[chunk.index.searchsorted(cutoff, side='left'):])
+        return pd.concat(pieces[::-1]) if len(pieces) > 1 else pieces[0]
+
+    def _append(self, new_rows):
+        """Merge appended rows into the views."""
+        added = new_rows.set_index('Date').sort_index()
+        if added.empty:
+            return
+        first = added.index[0]
+        last = self._chunks[-1].index[-1] if len(self._chunks[-1]) else None
+        if last is not None and first < last:
+            # Rows arrived out of date order, so the index must be re-sorted
+            self._rebuild(pd.concat(self._chunks + [added]).sort_index(kind='stable'), self.rows + len(new_rows))
+            return
+        self._chunks.append(added)
+        self.rows += len(new_rows)
+
+        for rule, pieces in self._resampled.items():
+            # Bins before the one holding the earliest new row are unchanged
+            cutoff = to_offset(rule).rollback(first.normalize())
+            while pieces and pieces[-1].index[0] >= cutoff:
+                pieces.pop()
+            if pieces:
+                pieces[-1] = pieces[-1].iloc[:pieces[-1].index.searchsorted(cutoff, side='left')]
+            pieces.append(resample_trend(self._rows_from(cutoff), rule))
+
+    @property
+    def indexed(self):
+        """The trend data with a sorted DatetimeIndex."""
+        with self._lock:
+            return _collapse(self._chunks)
+
+    def load(self, version, frame):
+        """
+        Bring the views up to a version of a whole dataset, e.g. a published Arrow copy.
+
+        Args:
+            version (tuple): Version key of the data.
+            frame (pd.DataFrame): The data.
+        """
+        with self._lock:
+            if version != self.version:
+                self._rebuild(frame.set_index('Date').sort_index(), len(frame))
+                self.version, self.generation = version, None
+
+    def follow(self, tail):
+        """
+        Bring the views up to date with a tailed CSV, merging only the rows appended since.
+
+        Args:
+            tail (CsvTail): Polled tail of the trend data file.
+        """
+        with self._lock:
+            generation, rows, frame, appended = tail.read_since(self.generation, self.rows)
+            if not appended:
+                self._rebuild(frame.set_index('Date').sort_index(), len(frame))
+            elif len(frame):
+                self._append(frame)
+            self.generation = generation
+            self.version = ('csv', generation, rows)
+
+    def resampled(self, rule):
+        """Return the views resampled with a rule, computing them on first use."""
+        with self._lock:
+            if rule not in self._resampled:
+                self._resampled[rule] = [resample_trend(_collapse(self._chunks), rule)]
+            return _collapse(self._resampled[rule])
+
+
+@st.cache_resource
+def get_trend(path, source):
+    """Return the process-wide TrendCache of a trend data file and source ('file' or 'csv')."""
+    return TrendCache()
+
+
+def load_trend(path, live=False):
+    """
+    Return the up-to-date TrendCache of a trend data file.
+
+    Outside live mode the dataset is loaded whole, from its published Arrow
+    copy or its CSV. Live mode follows rows appended to the CSV itself.
+
+    Args:
+        path (str): Path to the trend CSV file.
+        live (bool): Whether to follow rows appended to the CSV.
+
+    Returns:
+        TrendCache: Views of the current data.
+    """
+    if not live:
+        trend = get_trend(path, 'file')
+        trend.load(*load_dataset_version(path))
+        return trend
+
+    tail = get_tail(path)
+    tail.poll()
+    trend = get_trend(path, 'csv')
+    trend.follow(tail)
+    return trend
+
+
+def slice_dates(indexed, start, end, rule=None):
+    """
+    Slice a frame with a sorted DatetimeIndex to an inclusive date range.
+
+    Uses binary search on the index, so the cost does not grow with the
+    number of rows outside the range. For resampled frames every bin that
+    overlaps the range is kept, including those starting before ``start``.
+
+    Args:
+        indexed (pd.DataFrame): Frame with a sorted DatetimeIndex.
+        start (date): First day to include.
+        end (date): Last day to include.
+        rule (str): Resample rule of the frame, or None for raw rows.
+
+    Returns:
+        pd.DataFrame: Rows within the range.
+    """
+    start = pd.Timestamp(start)
+    if rule is not None:
+        # Bins are labelled by their first day, so floor the start to the bin containing it
+        start = to_offset(rule).rollback(start)
+    left = indexed.index.searchsorted(start, side='left')
+    right = indexed.index.searchsorted(pd.Timestamp(end + timedelta(days=1)), side='left')
+    return indexed.iloc[left:right]
+
+
+def trend_view(trend, key):
+    """
+    Show date-range and resolution controls and return the matching trend rows.
+
+    Args:
+        trend (TrendCache): Views of the trend data.
+        key (str): Widget key prefix, unique per page section.
+
+    Returns:
+        pd.DataFrame: Trend rows with a 'Date' column, for the selected range and resolution.
+    """
+    indexed = trend.indexed
+    if indexed.empty:
+        return indexed.reset_index()
+
+    first_day, last_day = indexed.index[0].date(), indexed.index[-1].date()
+    range_col, resolution_col = st.columns([2, 1])
+    selected_range = range_col.date_input(
+        "Date range", value=(first_day, last_day),
+        min_value=first_day, max_value=last_day, key=f"{key}_date_range"
+    )
+    resolution = resolution_col.radio(
+        "Resolution", list(RESOLUTIONS), horizontal=True, key=f"{key}_resolution"
+    )
+
+    # The picker returns a single date while the user is choosing the range end, and none once cleared
+    if len(selected_range) == 2:
+        start, end = selected_range
+    elif len(selected_range) == 1:
+        start, end = selected_range[0], last_day
+    else:
+        start, end = first_day, last_day
+
+    rule = RESOLUTIONS[resolution]
+    if rule is not None:
+        indexed = trend.resampled(rule)
+    return slice_dates(indexed, start, end, rule).reset_index()
+
+
+def live_mode_enabled():
+    """Show the live refresh toggle in the sidebar and return its state."""
+    return st.sidebar.toggle(
+        "Live refresh", key="live_refresh",
+        help=f"Redraw trend charts every {LIVE_REFRESH_SECONDS} seconds with newly appended data."
+    )
+
+
+def display_trend_section(path, render, live=False):
+    """
+    Render a trend section from a data file.
+
+    The section gets date-range and resolution controls and the render
+    function receives only the rows for the current selection. In live mode
+    the section runs as a fragment on a timer, so only this section is
+    redrawn and only newly appended bytes are parsed.
+
+    Args:
+        path (str): Path to the trend CSV file.
+        render (callable): Function drawing the section from a DataFrame.
+        live (bool): Whether to refresh the section on a timer.
+    """
+    def section():
+        render(trend_view(load_trend(path, live), key=path))
+
+    if live:
+        st.fragment(section, run_every=LIVE_REFRESH_SECONDS)()
+    else:
+        section()
+
+
+def table_figure(data):
+    """Build a table figure of a DataFrame, the static counterpart of st.dataframe."""
+    import plotly.graph_objects as go  # Deferred until a snapshot is actually built
+    cells = [
+        data[column].dt.strftime('%Y-%m-%d') if pd.api.types.is_datetime64_any_dtype(data[column]) else data[column]
+        for column in data.columns
+    ]
+    return go.Figure(go.Table(header=dict(values=list(data.columns)), cells=dict(values=cells)))
@@ -0,0 +1,315 @@
+"""Shared HTTP client for the data collectors.
+
+One ``AdaptiveHttpClient`` gives every collector:
+
+- keep-alive connection pooling through a single ``requests.Session``,
+- retries with exponential backoff and full jitter,
+- ``Retry-After`` / ``x-rate-limit-reset`` handling on 429 responses,
+- a per-host circuit breaker that fails fast while an API is down,
+- AIMD adaptive concurrency: the number of requests allowed in flight grows
+  by one per window of healthy responses and is halved on 429/5xx.
+"""
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Status codes that mean "back off and try again"
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised when a host's circuit breaker is open and requests are not sent."""
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limiter.
+
+    Args:
+        initial (int): Starting number of requests allowed in flight.
+        minimum (int): Lower bound of the limit.
+        maximum (int): Upper bound of the limit.
+    """
+
+    def __init__(self, initial=4, minimum=1, maximum=16):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(initial)
+        self.in_flight = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """Block until a request slot is free."""
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self, overloaded=False):
+        """
+        Free a request slot and adapt the limit.
+
+        Args:
+            overloaded (bool): Whether the response signalled overload (429/5xx).
+        """
+        with self._condition:
+            self.in_flight -= 1
+            if overloaded:
+                self.limit = max(self.minimum, self.limit / 2)
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one host.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    requests fail fast for ``cooldown`` seconds; then a single trial request
+    is let through and its outcome closes or re-opens the circuit.
+
+    Args:
+        failure_threshold (int): Consecutive failures that open the circuit.
+        cooldown (float): Seconds to stay open before a trial request.
+    """
+
+    def __init__(self, failure_threshold=5, cooldown=30):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_progress = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Return True if a request may be sent now."""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at >= self.cooldown and not self.trial_in_progress:
+                self.trial_in_progress = True
+                return True
+            return False
+
+    def abandon(self):
+        """Forget a request whose outcome says nothing about the host, freeing the trial slot."""
+        with self._lock:
+            self.trial_in_progress = False
+
+    def record(self, success):
+        """Record the outcome of a request."""
+        with self._lock:
+            self.trial_in_progress = False
+            if success:
+                self.failures = 0
+                self.opened_at = None
+            else:
+                self.failures += 1
+                if self.failures >= self.failure_threshold:
+                    self.opened_at = time.monotonic()
+
+
+def _rate_limit_wait(headers):
+    """Return the server-requested wait in seconds from rate-limit headers, if any."""
+    retry_after = headers.get("Retry-After")
+    if retry_after:
+        try:
+            return max(float(retry_after), 0)
+        except ValueError:
+            try:
+                return max(parsedate_to_datetime(retry_after).timestamp() - time.time(), 0)
+            except (TypeError, ValueError):
+                pass
+    reset = headers.get("x-rate-limit-reset")
+    if reset:
+        try:
+            return max(int(reset) - time.time(), 0)
+        except ValueError:
+            pass
+    return None
+
+
+class AdaptiveHttpClient:
+    """
+    Pooled, retrying, self-throttling HTTP client shared by all collectors.
+
+    Args:
+        max_retries (int): Retries per request after the first attempt.
+        backoff_base (float): Base delay of the exponential backoff in seconds.
+        backoff_cap (float): Maximum backoff delay in seconds.
+        initial_concurrency (int): Starting number of requests in flight.
+        max_concurrency (int): Upper bound of requests in flight (and pool size).
+        failure_threshold (int): Consecutive failures that open a host's circuit.
+        cooldown (float): Seconds an open circuit waits before a trial request.
+        timeout (float): Default request timeout in seconds.
+    """
+
+    def __init__(self, max_retries=3, backoff_base=1.0, backoff_cap=60.0, initial_concurrency=4,
+                 max_concurrency=16, failure_threshold=5, cooldown=30.0, timeout=30.0):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.timeout = timeout
+        self.limiter = AdaptiveLimiter(initial_concurrency, maximum=max_concurrency)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=max_concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._breakers = {}
+        self._breakers_lock = threading.Lock()
+
+    def breaker(self, host):
+        """Return the circuit breaker for a host."""
+        with self._breakers_lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(self.failure_threshold, self.cooldown)
+            return self._breakers[host]
+
+    def _backoff(self, attempt, backoff_base):
+        """Exponential backoff with full jitter."""
+        return random.uniform(0, min(self.backoff_cap, backoff_base * 2 ** attempt))
+
+    def _run(self, host, send, status_of, max_retries, backoff_base):
+        """
+        Send a request with retries, throttling and circuit breaking.
+
+        Args:
+            host (str): Host the request goes to, for circuit breaking.
+            send (callable): Sends the request and returns a response, or raises.
+            status_of (callable): Maps an exception to its (status, headers), or None
+                if it should be re-raised immediately.
+            max_retries (int): Retries after the first attempt.
+            backoff_base (float): Base delay of the exponential backoff.
+
+        Returns:
+            The value returned by ``send``.
+        """
+        breaker = self.breaker(host)
+        for attempt in range(max_retries + 1):
+            if not breaker.allow():
+                raise CircuitOpenError(f"Circuit open for {host}; not sending request.")
+
+            self.limiter.acquire()
+            error, status, headers = None, None, {}
+            try:
+                result = send()
+                status, headers = getattr(result, "status_code", 200), getattr(result, "headers", {})
+            except Exception as err:
+                classified = status_of(err)
+                if classified is None:
+                    self.limiter.release()
+                    if getattr(err, "response", None) is not None:
+                        breaker.record(success=True)  # The host answered, e.g. with a 400 or 401
+                    else:
+                        breaker.abandon()
+                    raise
+                error, (status, headers) = err, classified
+            except BaseException:
+                self.limiter.release()
+                breaker.abandon()
+                raise
+
+            overloaded = error is not None or status in RETRYABLE_STATUS
+            self.limiter.release(overloaded=overloaded)
+            # 429 means "slow down", not "host unhealthy"
+            breaker.record(success=status is not None and status < 500)
+
+            if error is None and not overloaded:
+                return result
+            if attempt == max_retries:
+                if error is not None:
+                    raise error
+                return result
+
+            wait = _rate_limit_wait(headers) if status == 429 else None
+            if wait is None:
+                wait = self._backoff(attempt, backoff_base)
+            print(f"Request to {host} failed ({status or error}). Retrying in {wait:.1f} seconds...")
+            time.sleep(wait)
+
+    def request(self, method, url, max_retries=None, backoff_base=None, **kwargs):
+        """
+        Send an HTTP request through the pooled session.
+
+        Retryable responses (429/5xx) and connection errors are retried. The
+        final response is returned whatever its status, so callers keep their
+        own handling of e.g. 400 responses.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Request URL.
+            max_retries (int): Override of the client's retry count.
+            backoff_base (float): Override of the client's base backoff delay.
+            **kwargs: Passed to ``requests.Session.request``.
+
+        Returns:
+            requests.Response: The final response.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+
+        def status_of(err):
+            if isinstance(err, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+                return None, {}
+            return None
+
+        return self._run(
+            urlparse(url).netloc,
+            lambda: self.session.request(method, url, **kwargs),
+            status_of,
+            self.max_retries if max_retries is None else max_retries,
+            self.backoff_base if backoff_base is None else backoff_base,
+        )
+
+    def get(self, url, **kwargs):
+        """Send a GET request; see ``request``."""
+        return self.request("GET", url, **kwargs)
+
+    def call(self, func, args=(), kwargs=None, host="api", max_retries=None, backoff_base=None):
+        """
+        Call an SDK function (e.g. a tweepy client method) with the same retry policy.
+
+        Exceptions carrying a ``response`` with a retryable status, and
+        connection errors, are retried; any other exception is raised at once.
+
+        Args:
+            func (callable): Function that performs one API request.
+            args (tuple): Positional arguments for ``func``.
+            kwargs (dict): Keyword arguments for ``func``.
+            host (str): Host name used for circuit breaking.
+            max_retries (int): Override of the client's retry count.
+            backoff_base (float): Override of the client's base backoff delay.
+
+        Returns:
+            The value returned by ``func``.
+        """
+        kwargs = kwargs or {}
+
+        def status_of(err):
+            response = getattr(err, "response", None)
+            if response is not None and getattr(response, "status_code", None) in RETRYABLE_STATUS:
+                return response.status_code, response.headers
+            if isinstance(err, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+                return None, {}
+            return None
+
+        return self._run(
+            host,
+            lambda: func(*args, **kwargs),
+            status_of,
+            self.max_retries if max_retries is None else max_retries,
+            self.backoff_base if backoff_base is None else backoff_base,
+        )
+
+
+# Process-wide client shared by every collector
+client = AdaptiveHttpClient()
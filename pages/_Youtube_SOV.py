@@ -1,8 +1,9 @@
 """Third Party Imports."""
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+from dashboard_data import (
+    display_trend_section, live_mode_enabled, load_dataset, show_startup_report, start_warm_up, table_figure,
+    timed
+)
 
 # Constants
 DEFAULT_CSV_PATHS = {
@@ -12,26 +13,42 @@ DEFAULT_CSV_PATHS = {
     "ronin_vs_field": 'csvs/SOV - YT_RVF.csv'
 }
 
+# Dashboard sections in page order: (subheader, kind, CSV key, chart label)
+SECTIONS = [
+    ("Axie Infinity Trend", "trend", "main_data", "Axie Infinity Trend Over Time"),
+    ("Axie Infinity vs Field", "comparison", "axie_vs_field", "Axie Infinity VS Field"),
+    ("Ronin Games vs Each Other", "comparison", "ronin_games", "Ronin Games VS Each Other"),
+    ("Ronin Games vs Field", "comparison", "ronin_vs_field", "Ronin Games VS Field"),
+]
+METRICS_OPTIONS = ['View Count', 'Like Count', 'Comment Count']
+
 # Data Loading Functions
 def read_data(filename):
-    """Read data from CSV and ensure 'Date' column is in datetime format if present."""
-    df = pd.read_csv(filename)
-    if 'Date' in df.columns:
-        df['Date'] = pd.to_datetime(df['Date'])
-    return df
+    """Read data from the shared dataset cache, with the 'Date' column parsed as datetime if present."""
+    return load_dataset(filename)
 
 # Chart Generation Functions
+TREND_COUNT_TYPES = ['View Count', 'Like Count', 'Comment Count']
+
+def line_chart_figures(data):
+    """Build one line chart figure per trend count type."""
+    import plotly.express as px  # Deferred until a chart is actually drawn
+    figures = []
+    for count_type in TREND_COUNT_TYPES:
+        fig = px.line(data, x='Date', y=count_type, title=f'{count_type} Over Time')
+        fig.update_layout(xaxis_title='Date', yaxis_title=count_type)
+        figures.append(fig)
+    return figures
+
 def generate_line_chart(data, title="Trend Over Time"):
     """Generate line charts for selected count types."""
     st.dataframe(data)
-    for count_type in ['View Count', 'Like Count', 'Comment Count']:
-        fig = px.line(data, x='Date', y=count_type, title=f'{count_type} Over Time')
-        fig.update_layout(xaxis_title='Date', yaxis_title=count_type)
+    for fig in line_chart_figures(data):
         st.plotly_chart(fig)
 
-def generate_pie_chart(data, options, widget_id, chart_title):
-    """Generate pie chart for selected metrics."""
-    selected_options = st.multiselect(widget_id, options, default=options, key=f"pie_chart_{widget_id}")
+def pie_chart_figure(data, selected_options, chart_title):
+    """Build a pie chart figure for the given metrics."""
+    import plotly.graph_objects as go
     fig = go.Figure()
     for option in selected_options:
         fig.add_trace(go.Pie(
@@ -39,11 +56,16 @@ def generate_pie_chart(data, options, widget_id, chart_title):
             name=option, textinfo='label+percent', textposition='inside'
         ))
     fig.update_layout(title=chart_title)
-    st.plotly_chart(fig)
+    return fig
 
-def generate_bar_chart(data, options, widget_id, chart_title="Bar Chart of Metrics"):
-    """Generate a stacked bar chart of selected metrics."""
-    selected_options = st.multiselect(widget_id, options, default=options, key=f"bar_chart_{widget_id}")
+def generate_pie_chart(data, options, widget_id, chart_title):
+    """Generate pie chart for selected metrics."""
+    selected_options = st.multiselect(widget_id, options, default=options, key=f"pie_chart_{widget_id}")
+    st.plotly_chart(pie_chart_figure(data, selected_options, chart_title))
+
+def bar_chart_figure(data, selected_options, chart_title="Bar Chart of Metrics"):
+    """Build a stacked bar chart figure of the given metrics."""
+    import plotly.graph_objects as go
     grouped_data = data.groupby('Game')[selected_options].sum().reset_index()
     grouped_data['Total'] = grouped_data[selected_options].sum(axis=1)
     sorted_data = grouped_data.sort_values(by='Total', ascending=True)
@@ -59,40 +81,50 @@ def generate_bar_chart(data, options, widget_id, chart_title="Bar Chart of Metri
         yaxis_title='Game',
         barmode='stack'
     )
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
+
+def generate_bar_chart(data, options, widget_id, chart_title="Bar Chart of Metrics"):
+    """Generate a stacked bar chart of selected metrics."""
+    selected_options = st.multiselect(widget_id, options, default=options, key=f"bar_chart_{widget_id}")
+    st.plotly_chart(bar_chart_figure(data, selected_options, chart_title), use_container_width=True)
 
 
 # Main Dashboard UI
 def display_dashboard():
     """Displays the main dashboard with interactive visualizations."""
     st.title("YouTube Share of Voice Analysis")
+    live = live_mode_enabled()
 
-    # Load and display Axie Infinity trend data
-    st.subheader("Axie Infinity Trend")
-    main_data = read_data(DEFAULT_CSV_PATHS["main_data"])
-    generate_line_chart(main_data, "Axie Infinity Trend Over Time")
-
-    # Define metrics options for charts
-    metrics_options = ['View Count', 'Like Count', 'Comment Count']
-    
-    # Display Axie Infinity vs Field charts
-    st.subheader("Axie Infinity vs Field")
-    axie_vs_field_data = read_data(DEFAULT_CSV_PATHS["axie_vs_field"])
-    generate_pie_chart(axie_vs_field_data, metrics_options, 'Select AVF Metrics', 'Axie Infinity VS Field')
-    generate_bar_chart(axie_vs_field_data, metrics_options, 'Select AVF Metrics', 'Axie Infinity VS Field Bar Chart')
-
-    # Display Ronin Games vs Each Other charts
-    st.subheader("Ronin Games vs Each Other")
-    ronin_games_data = read_data(DEFAULT_CSV_PATHS["ronin_games"])
-    generate_pie_chart(ronin_games_data, metrics_options, 'Select Ronin Games Metrics', 'Ronin Games VS Each Other')
-    generate_bar_chart(ronin_games_data, metrics_options, 'Select Ronin Games Metrics', 'Ronin Games VS Each Other Bar Chart')
+    for title, kind, key, label in SECTIONS:
+        st.subheader(title)
+        if kind == "trend":
+            display_trend_section(
+                DEFAULT_CSV_PATHS[key], lambda data, label=label: generate_line_chart(data, label), live
+            )
+        else:
+            data = read_data(DEFAULT_CSV_PATHS[key])
+            generate_pie_chart(data, METRICS_OPTIONS, f'Select {label} Metrics', label)
+            generate_bar_chart(data, METRICS_OPTIONS, f'Select {label} Metrics', f'{label} Bar Chart')
 
-    # Display Ronin Games vs Field charts
-    st.subheader("Ronin Games vs Field")
-    ronin_vs_field_data = read_data(DEFAULT_CSV_PATHS["ronin_vs_field"])
-    generate_pie_chart(ronin_vs_field_data, metrics_options, 'Select RVF Metrics', 'Ronin Games VS Field')
-    generate_bar_chart(ronin_vs_field_data, metrics_options, 'Select RVF Metrics', 'Ronin Games VS Field Bar Chart')
+# Static Snapshot
+def snapshot_figures():
+    """Build every figure of the dashboard with its default selections, in page order."""
+    figures = []
+    for title, kind, key, label in SECTIONS:
+        data = read_data(DEFAULT_CSV_PATHS[key])
+        if kind == "trend":
+            section_figures = [table_figure(data)] + line_chart_figures(data)
+        else:
+            section_figures = [
+                pie_chart_figure(data, METRICS_OPTIONS, label),
+                bar_chart_figure(data, METRICS_OPTIONS, f'{label} Bar Chart')
+            ]
+        figures.extend((title, fig) for fig in section_figures)
+    return figures
 
 # Run main dashboard function
 if __name__ == '__main__':
-    display_dashboard()
+    start_warm_up()
+    with timed("First render of YouTube page"):
+        display_dashboard()
+    show_startup_report()
@@ -0,0 +1,25 @@
+"""Publish the dashboard datasets as memory-mappable Arrow files.
+
+Run from the repository root after each data refresh:
+
+    python publish_datasets.py
+
+Every CSV in ``csvs/`` is converted to ``datasets/<name>.arrow`` and swapped
+into place atomically. Dashboard worker processes memory-map these files, so
+they share one page-cached copy of each dataset instead of holding their own.
+"""
+import argparse
+import glob
+
+from dashboard_data import DATASETS_DIR, WARM_UP_GLOB, publish_dataset
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Publish dashboard datasets as Arrow files.")
+    parser.add_argument("csv_files", nargs="*", help="CSV datasets to publish (default: every file in csvs/)")
+    parser.add_argument("--datasets-dir", default=DATASETS_DIR, help="directory to publish into")
+    args = parser.parse_args()
+
+    for csv_path in args.csv_files or sorted(glob.glob(WARM_UP_GLOB)):
+        target = publish_dataset(csv_path, args.datasets_dir)
+        print(f"Published {csv_path} to {target}")
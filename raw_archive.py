@@ -0,0 +1,186 @@
+"""Partitioned Parquet archive of raw collector output.
+
+Collectors append their raw rows under
+``archive/platform=<platform>/game=<game>/date=<YYYY-MM-DD>/`` as
+zstd-compressed Parquet files. Transforms read back only the partitions and
+columns they need, with the platform/game/date filters pushed down to the
+directory level. Every platform has one fixed column schema, so part files
+written from different batches always read back together.
+"""
+import os
+import uuid
+from datetime import datetime, timezone
+
+import pandas as pd
+
+# Root directory of the archive (scripts run from the repo root)
+ARCHIVE_DIR = 'archive'
+
+# Partition columns, outermost first
+PARTITION_COLUMNS = ('platform', 'game', 'date')
+
+# Column added to every archived row, used to keep the latest copy of a record
+COLLECTED_AT = 'Collected At'
+
+# Data columns of each platform and their types. Types are fixed rather than
+# inferred per batch, where e.g. a column that is empty in one batch would
+# be stored as null and clash with a later batch.
+ARCHIVE_SCHEMAS = {
+    'twitter': {
+        'Tweet ID': 'int64',
+        'Time': 'timestamp',
+        'User': 'category',
+        'Tweet': 'string',
+        'Coordinates': 'string',
+        'Retweet Count': 'int64',
+        'Likes Count': 'int64',
+        'Language': 'category',
+    },
+    'twitter_timeline': {
+        'tweet_id': 'string',
+        'content': 'string',
+        'likes': 'int64',
+        'retweets': 'int64',
+    },
+    'twitter_counts': {
+        'Query': 'string',
+        'Date': 'date',
+        'Tweet Count': 'int64',
+    },
+    'youtube': {
+        'Video ID': 'string',
+        'Published Date': 'string',
+        'Title': 'string',
+        'View Count': 'int64',
+        'Like Count': 'int64',
+        'Comment Count': 'int64',
+        'Channel Title': 'string',
+        'Subscriber Count': 'int64',
+    },
+}
+
+
+def _partitioning(columns=PARTITION_COLUMNS):
+    """Hive partitioning with explicit string types, so dates compare as ISO strings."""
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    return ds.partitioning(pa.schema([(column, pa.string()) for column in columns]), flavor='hive')
+
+
+def archive_schema(platform):
+    """
+    Return the Arrow schema of a platform's archived data columns.
+
+    Args:
+        platform (str): Source platform.
+
+    Returns:
+        pa.Schema: Data columns followed by the 'Collected At' column.
+    """
+    import pyarrow as pa
+
+    types = {
+        'int64': pa.int64(),
+        'string': pa.string(),
+        'category': pa.dictionary(pa.int32(), pa.string()),
+        'timestamp': pa.timestamp('ns', tz='UTC'),
+        'date': pa.date32(),
+    }
+    fields = [(column, types[kind]) for column, kind in ARCHIVE_SCHEMAS[platform].items()]
+    return pa.schema(fields + [(COLLECTED_AT, pa.timestamp('us', tz='UTC'))])
+
+
+def write_archive(df, platform, game, date_column, archive_dir=ARCHIVE_DIR):
+    """
+    Append raw collector output to the archive.
+
+    Rows are partitioned by the calendar day of ``date_column``. Every call
+    writes new files, so nothing already archived is overwritten; readers
+    use ``unique_key`` to keep the latest copy of re-collected records.
+    Data columns are stored with the platform's types from
+    ``ARCHIVE_SCHEMAS``; a data column named like a partition column
+    ('platform', 'game' or 'date') is not stored separately, only the
+    partition value is kept.
+
+    Args:
+        df (pd.DataFrame): Raw rows to archive.
+        platform (str): Source platform, a key of ``ARCHIVE_SCHEMAS``.
+        game (str): Game, handle or query the rows were collected for.
+        date_column (str): Column holding each row's timestamp or date.
+        archive_dir (str): Root directory of the archive.
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    if df.empty:
+        return
+
+    rows = len(df)
+    days = pd.to_datetime(df[date_column]).dt.strftime('%Y-%m-%d')
+    collected_at = pa.array([datetime.now(timezone.utc)] * rows, pa.timestamp('us', tz='UTC'))
+    schema = archive_schema(platform)
+    data = df.drop(columns=[column for column in PARTITION_COLUMNS if column in df.columns])
+    table = (
+        pa.Table.from_pandas(data, schema=schema.remove(schema.get_field_index(COLLECTED_AT)), preserve_index=False)
+        .append_column(schema.field(COLLECTED_AT), collected_at)
+        .append_column('platform', pa.array([platform] * rows, pa.string()))
+        .append_column('game', pa.array([game] * rows, pa.string()))
+        .append_column('date', pa.array(days.tolist(), pa.string()))
+    )
+
+    ds.write_dataset(
+        table, archive_dir, format='parquet', partitioning=_partitioning(),
+        basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior='overwrite_or_ignore',
+        file_options=ds.ParquetFileFormat().make_write_options(compression='zstd'),
+    )
+    print(f"Archived {rows} rows to {archive_dir}/platform={platform}/game={game}")
+
+
+def read_archive(platform, games=None, start_date=None, end_date=None, columns=None,
+                 unique_key=None, archive_dir=ARCHIVE_DIR):
+    """
+    Read archived rows, touching only the matching partitions and columns.
+
+    Args:
+        platform (str): Source platform to read.
+        games (list): Games to read; all games if None.
+        start_date (date or str): First day to include; no lower bound if None.
+        end_date (date or str): Last day to include; no upper bound if None.
+        columns (list): Data columns to read; all columns if None. The 'game'
+            and 'date' partition columns are always included.
+        unique_key (list): Columns identifying a record. When given, only the
+            most recently collected copy of each record is kept.
+        archive_dir (str): Root directory of the archive.
+
+    Returns:
+        pd.DataFrame: Matching rows.
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    condition = ds.scalar(True)
+    if games is not None:
+        condition &= ds.field('game').isin(list(games))
+    if start_date is not None:
+        condition &= ds.field('date') >= str(start_date)
+    if end_date is not None:
+        condition &= ds.field('date') <= str(end_date)
+
+    if columns is not None:
+        columns = list(dict.fromkeys(list(columns) + ['game', 'date'] + ([COLLECTED_AT] if unique_key else [])))
+
+    platform_dir = os.path.join(archive_dir, f'platform={platform}')
+    if not os.path.isdir(platform_dir):
+        return pd.DataFrame(columns=columns)
+
+    # Read with the platform's fixed schema, so every part file is cast to the same types
+    partition_columns = PARTITION_COLUMNS[1:]
+    schema = pa.unify_schemas([archive_schema(platform), _partitioning(partition_columns).schema])
+    dataset = ds.dataset(platform_dir, format='parquet', schema=schema,
+                         partitioning=_partitioning(partition_columns))
+    df = dataset.to_table(columns=columns, filter=condition).to_pandas()
+    if unique_key:
+        df = df.sort_values(COLLECTED_AT).drop_duplicates(subset=unique_key, keep='last')
+    return df.reset_index(drop=True)
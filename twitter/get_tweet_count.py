@@ -1,9 +1,11 @@
 import requests
 import csv
 import os
-import time
+import pandas as pd
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
+from http_client import client as http
+from raw_archive import write_archive
 
 # Load environment variables
 load_dotenv()
@@ -56,52 +58,24 @@ def get_tweet_count(query, start_time, end_time):
     }
     
     max_retries = 3
-    for attempt in range(max_retries):
-        try:
-            response = requests.get(endpoint_url, headers=headers, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return data.get("meta", {}).get("total_tweet_count", 0)
+    try:
+        # The shared client retries 429/5xx with backoff, honouring x-rate-limit-reset
+        response = http.get(endpoint_url, headers=headers, params=params, max_retries=max_retries)
+        response.raise_for_status()
+        data = response.json()
+        return data.get("meta", {}).get("total_tweet_count", 0)
 
-        except requests.exceptions.HTTPError as err:
-            if response.status_code == 429:  # Rate limit exceeded
-                reset_time = int(response.headers.get("x-rate-limit-reset", time.time()))
-                wait_time = max(reset_time - time.time(), 0)
-                print(f"Rate limit exceeded. Retrying in {wait_time} seconds...")
-                time.sleep(wait_time)
-            elif response.status_code == 400:
-                print(f"Bad request for {query} on {start_time.date()}: {err}")
-                return None
-            else:
-                print(f"HTTP error occurred: {err}")
-                break
-        except Exception as err:
-            print(f"Other error occurred: {err}")
-            break
+    except requests.exceptions.HTTPError as err:
+        if response.status_code == 400:
+            print(f"Bad request for {query} on {start_time.date()}: {err}")
+            return None
+        print(f"HTTP error occurred: {err}")
+    except Exception as err:
+        print(f"Other error occurred: {err}")
     
     print(f"Failed to fetch tweet count for '{query}' after {max_retries} retries.")
     return None
 
-def save_to_csv(filename, data):
-    """
-    Save collected data to a CSV file.
-    
-    Args:
-        filename (str): Name of the CSV file.
-        data (list): List of data rows to be saved.
-    """
-    file_exists = os.path.isfile(filename)
-    
-    with open(filename, 'a', newline='', encoding='utf-8') as csvfile:
-        csvwriter = csv.writer(csvfile)
-        
-        # Write header if the file does not exist
-        if not file_exists:
-            csvwriter.writerow(['Query', 'Date', 'Tweet Count'])
-        
-        # Write data rows
-        csvwriter.writerows(data)
-
 if __name__ == "__main__":
     # Load queries from CSV file
     handles_file = "twitter/game_list.csv.csv"
@@ -110,7 +84,6 @@ if __name__ == "__main__":
     # Define the date range
     start_date = datetime(2024, 11, 10)
     end_date = datetime(2024, 11, 11)
-    csv_filename = f"Data_pull_{start_date.strftime('%Y-%m-%d')}_to_{end_date.strftime('%Y-%m-%d')}.csv"
 
     # Collect tweet count data
     all_data = []
@@ -128,6 +101,7 @@ if __name__ == "__main__":
             
             current_date = next_date
 
-    # Save data to CSV
-    save_to_csv(csv_filename, all_data)
-    print(f"Data saved to {csv_filename}")
+    # Append the daily counts to the archive, one partition set per query
+    counts_df = pd.DataFrame(all_data, columns=['Query', 'Date', 'Tweet Count'])
+    for query, query_counts in counts_df.groupby('Query'):
+        write_archive(query_counts, 'twitter_counts', query, 'Date')
@@ -0,0 +1,148 @@
+"""Pack many games into OR-combined search queries and attribute results locally."""
+from collections import deque
+
+# Maximum query length accepted by the recent search endpoint (Basic access)
+MAX_QUERY_LENGTH = 512
+
+# Characters that may continue a hashtag or handle
+_WORD_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789_")
+
+
+def game_query_term(game):
+    """
+    Build the search term for a game.
+
+    Handles (``@name``) and explicit hashtags are used as-is; bare names are
+    searched as hashtags.
+
+    Args:
+        game (str): Entry from the game list.
+
+    Returns:
+        str: Search term for the game.
+    """
+    return game if game.startswith(("@", "#")) else f"#{game}"
+
+
+def pack_queries(games, max_length=MAX_QUERY_LENGTH):
+    """
+    Greedily combine game search terms into as few OR queries as fit the length limit.
+
+    Args:
+        games (list): Games to search for.
+        max_length (int): Maximum length of a single query.
+
+    Returns:
+        list: ``(query, games)`` tuples, one per search request.
+    """
+    packs = []
+    terms, members, length = [], [], 0
+    for game in games:
+        term = game_query_term(game)
+        added = len(term) + (len(" OR ") if terms else 0)
+        if terms and length + added > max_length:
+            packs.append((" OR ".join(terms), members))
+            terms, members, length = [], [], 0
+            added = len(term)
+        terms.append(term)
+        members.append(game)
+        length += added
+    if terms:
+        packs.append((" OR ".join(terms), members))
+    return packs
+
+
+class GameMatcher:
+    """
+    Aho-Corasick matcher that finds which games a tweet mentions.
+
+    All game terms are matched case-insensitively in a single pass over the
+    tweet text. A match only counts when it is not followed by another word
+    character, so ``#Axie`` does not match ``#AxieInfinity``. Hashtag and
+    mention entities, when present, are looked up directly.
+
+    Args:
+        games (list): Games to match, as given in the game list.
+    """
+
+    def __init__(self, games):
+        self.term_games = {}
+        for game in games:
+            self.term_games.setdefault(game_query_term(game).lower(), []).append(game)
+
+        # Trie: goto transitions, failure links and terms ending at each node
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for term in self.term_games:
+            node = 0
+            for char in term:
+                nxt = self.goto[node].get(char)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][char] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                node = nxt
+            self.output[node].append(term)
+
+        # Breadth-first pass to compute failure links
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and char not in self.goto[state]:
+                    state = self.fail[state]
+                self.fail[child] = self.goto[state].get(char, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def match_text(self, text):
+        """
+        Find the games whose terms appear in a piece of text.
+
+        Args:
+            text (str): Tweet text.
+
+        Returns:
+            set: Games mentioned in the text.
+        """
+        found = set()
+        if not text:
+            return found
+        text = text.lower()
+        node = 0
+        for i, char in enumerate(text):
+            while node and char not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(char, 0)
+            for term in self.output[node]:
+                end = i + 1
+                start = end - len(term)
+                if end < len(text) and text[end] in _WORD_CHARS:
+                    continue
+                if start > 0 and text[start - 1] in _WORD_CHARS:
+                    continue
+                found.update(self.term_games[term])
+        return found
+
+    def match_tweet(self, text, entities=None):
+        """
+        Find the games a tweet mentions, from its text and entities.
+
+        Args:
+            text (str): Tweet text.
+            entities (dict): Tweet entities as returned by the API, if requested.
+
+        Returns:
+            set: Games the tweet should be attributed to.
+        """
+        found = self.match_text(text)
+        if entities:
+            for hashtag in entities.get("hashtags", []):
+                found.update(self.term_games.get(f"#{hashtag.get('tag', '')}".lower(), ()))
+            for mention in entities.get("mentions", []):
+                found.update(self.term_games.get(f"@{mention.get('username', '')}".lower(), ()))
+        return found
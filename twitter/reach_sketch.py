@@ -0,0 +1,203 @@
+"""Third-party imports."""
+import argparse
+import hashlib
+import os
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+from twitter.tweet_index import DEFAULT_INDEX_PATH, TweetIndex
+
+# Register index bits: 2**12 one-byte registers (4 KiB per sketch, ~1.6% standard error)
+PRECISION = 12
+
+# Windows, in days, exported for the dashboard
+REACH_WINDOWS = (7, 30, 90)
+
+# Label of the cross-game total row in the export
+ALL_GAMES = "All Games"
+
+# Dashboard dataset holding the exported reach figures
+REACH_CSV_PATH = 'csvs/SOV - Twitter_unique_reach.csv'
+
+
+class HyperLogLog:
+    """
+    HyperLogLog sketch estimating the number of distinct values added.
+
+    Sketches of the same precision merge by taking the register-wise maximum,
+    so per-day sketches combine into any window or across games.
+
+    Args:
+        registers (np.ndarray): Existing registers to wrap; empty sketch if None.
+        precision (int): Number of register index bits.
+    """
+
+    def __init__(self, registers=None, precision=PRECISION):
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = np.zeros(self.m, dtype=np.uint8) if registers is None else registers
+
+    def add(self, value):
+        """Add a value (e.g. an author id) to the sketch."""
+        h = int.from_bytes(hashlib.blake2b(str(value).encode(), digest_size=8).digest(), 'big')
+        index = h >> (64 - self.precision)
+        rest = h & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other):
+        """Fold another sketch into this one."""
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self):
+        """Return the estimated number of distinct values."""
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        raw = alpha * self.m ** 2 / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * self.m and zeros:
+            return self.m * np.log(self.m / zeros)  # Linear counting for small cardinalities
+        return float(raw)
+
+    def to_bytes(self):
+        """Serialize the registers."""
+        return self.registers.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data, precision=PRECISION):
+        """Deserialize registers written by ``to_bytes``."""
+        return cls(np.frombuffer(data, dtype=np.uint8).copy(), precision)
+
+
+class ReachStore:
+    """
+    Per-(game, day) unique-author sketches persisted next to the tweet index.
+
+    Sketches touched during a run are kept in memory and written back by
+    ``flush``; each one is a 4 KiB blob in the ``reach_sketches`` table.
+
+    Args:
+        conn (sqlite3.Connection): Connection to the tweet index database.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS reach_sketches (
+                game TEXT NOT NULL,
+                day TEXT NOT NULL,
+                registers BLOB NOT NULL,
+                PRIMARY KEY (game, day)
+            ) WITHOUT ROWID
+        """)
+        self._dirty = {}
+
+    def _load(self, game, day):
+        """Return the stored sketch for a game and day, or an empty one."""
+        row = self.conn.execute(
+            "SELECT registers FROM reach_sketches WHERE game = ? AND day = ?", (game, day)
+        ).fetchone()
+        return HyperLogLog.from_bytes(row[0]) if row else HyperLogLog()
+
+    def add(self, game, day, author_id):
+        """
+        Count an author as reached by a game on a day.
+
+        Args:
+            game (str): Game the tweet was collected for.
+            day (str): Tweet day as YYYY-MM-DD.
+            author_id: Author of the tweet.
+        """
+        if author_id is None:
+            return
+        key = (game, day)
+        sketch = self._dirty.get(key)
+        if sketch is None:
+            sketch = self._dirty[key] = self._load(game, day)
+        sketch.add(author_id)
+
+    def flush(self):
+        """Write the sketches updated since the last flush."""
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO reach_sketches VALUES (?, ?, ?)",
+            [(game, day, sketch.to_bytes()) for (game, day), sketch in self._dirty.items()]
+        )
+        self.conn.commit()
+        self._dirty.clear()
+
+    def merged(self, games, start_day, end_day):
+        """
+        Merge the stored sketches of some games over an inclusive day range.
+
+        Args:
+            games (list): Games to include.
+            start_day (str): First day as YYYY-MM-DD.
+            end_day (str): Last day as YYYY-MM-DD.
+
+        Returns:
+            HyperLogLog: Union of the matching sketches.
+        """
+        sketch = HyperLogLog()
+        placeholders = ",".join("?" * len(games))
+        rows = self.conn.execute(
+            f"SELECT registers FROM reach_sketches WHERE game IN ({placeholders}) AND day BETWEEN ? AND ?",
+            (*games, start_day, end_day)
+        )
+        for (registers,) in rows:
+            sketch.merge(HyperLogLog.from_bytes(registers))
+        return sketch
+
+    def reach_table(self, games, windows=REACH_WINDOWS, end_day=None):
+        """
+        Estimate unique reach per game, and across all games, for each window.
+
+        Args:
+            games (list): Games to report.
+            windows (tuple): Window lengths in days, ending at ``end_day``.
+            end_day (date): Last day of every window; today if None.
+
+        Returns:
+            pd.DataFrame: One row per game plus an 'All Games' row, one
+            'Unique Reach {n}d' column per window.
+        """
+        end_day = end_day or date.today()
+        columns = {"Game": list(games) + [ALL_GAMES]}
+        for window in windows:
+            start_day = (end_day - timedelta(days=window - 1)).isoformat()
+            per_game = [self.merged([game], start_day, end_day.isoformat()) for game in games]
+            total = HyperLogLog()
+            for sketch in per_game:
+                total.merge(sketch)
+            columns[f"Unique Reach {window}d"] = [round(s.estimate()) for s in per_game + [total]]
+        return pd.DataFrame(columns)
+
+
+def export_reach_csv(store, games, path=REACH_CSV_PATH):
+    """
+    Export the unique reach table for the dashboard.
+
+    Args:
+        store (ReachStore): Sketch store to read.
+        games (list): Games to report.
+        path (str): Output CSV path.
+    """
+    # Replace the file atomically; the dashboard tails its datasets and expects rewrites to get a new file
+    tmp_path = f"{path}.tmp"
+    store.reach_table(games).to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    print(f"Unique reach saved to {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export unique-author reach from the stored sketches.")
+    parser.add_argument("--games-file", default='twitter/game_list.csv', help="game list CSV")
+    parser.add_argument("--index", default=DEFAULT_INDEX_PATH, help="tweet index database")
+    parser.add_argument("--output", default=REACH_CSV_PATH, help="CSV file to write")
+    args = parser.parse_args()
+
+    index = TweetIndex(args.index)
+    game_list = pd.read_csv(args.games_file)['game'].tolist()
+    export_reach_csv(ReachStore(index.conn), game_list, args.output)
+    index.close()
@@ -1,8 +1,12 @@
-import requests
+import json
 import pandas as pd
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 import os
+from twitter.tweet_index import TweetIndex
+from twitter.tweet_records import TweetRecordBuilder
+from http_client import client as http
+from raw_archive import read_archive, write_archive
 
 # Load environment variables from .env file
 load_dotenv()
@@ -14,21 +18,72 @@ BEARER_TOKEN = os.getenv('BEARER_TOKEN')
 if BEARER_TOKEN is None:
     raise ValueError("Bearer token not found. Please set it in the .env file.")
 
+# Column layout of fetched timeline tweets
+TIMELINE_SCHEMA = {
+    'tweet_id': 'object',
+    'date': 'category',  # one value per day, shared by all tweets of that day
+    'content': 'object',
+    'likes': 'int',
+    'retweets': 'int',
+}
+
+# Persistent username -> user ID cache (IDs never change)
+USER_ID_CACHE_PATH = 'twitter/user_ids.json'
+
+# Maximum number of usernames accepted by one /2/users/by request
+USERNAME_BATCH_SIZE = 100
+
 # Set up headers for the request
 headers = {
     'Authorization': f'Bearer {BEARER_TOKEN}'
 }
 
+def load_user_id_cache(path=USER_ID_CACHE_PATH):
+    """Load the username -> user ID cache, keyed by lowercase username"""
+    if not os.path.isfile(path):
+        return {}
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+def save_user_id_cache(cache, path=USER_ID_CACHE_PATH):
+    """Save the username -> user ID cache, replacing the file atomically"""
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        json.dump(cache, file, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def resolve_user_ids(usernames, cache_path=USER_ID_CACHE_PATH):
+    """Resolve usernames to user IDs, looking up cache misses 100 at a time"""
+    cache = load_user_id_cache(cache_path)
+    names = {username: username.lstrip('@').lower() for username in usernames}
+    misses = sorted({name for name in names.values() if name not in cache})
+
+    for i in range(0, len(misses), USERNAME_BATCH_SIZE):
+        batch = misses[i:i + USERNAME_BATCH_SIZE]
+        response = http.get(
+            'https://api.twitter.com/2/users/by', headers=headers, params={'usernames': ','.join(batch)}
+        )
+        response.raise_for_status()  # Check for HTTP errors
+        payload = response.json()
+        for user in payload.get('data', []):
+            cache[user['username'].lower()] = user['id']
+        for error in payload.get('errors', []):
+            print(f"Could not resolve '{error.get('value')}': {error.get('detail')}")
+
+    if misses:
+        save_user_id_cache(cache, cache_path)
+
+    return {username: cache[name] for username, name in names.items() if name in cache}
+
 def get_user_id(username):
     """Retrieve Twitter user ID by username"""
-    url = f'https://api.twitter.com/2/users/by/username/{username}'
-    response = requests.get(url, headers=headers)
-    response.raise_for_status()  # Check for HTTP errors
-    user_data = response.json()
-    return user_data['data']['id']
+    user_ids = resolve_user_ids([username])
+    if username not in user_ids:
+        raise ValueError(f"User '{username}' not found.")
+    return user_ids[username]
 
-def fetch_tweets(user_id, start_date_str, end_date_str):
-    """Fetch tweets within a given date range"""
+def fetch_tweets(user_id, start_date_str, end_date_str, index=None, game=None):
+    """Fetch tweets within a given date range as a DataFrame, recording them in the tweet index if given"""
     # Convert date strings to ISO 8601 format
     start_date = datetime.strptime(start_date_str, '%Y-%m-%d').isoformat() + 'Z'
     end_date = (datetime.strptime(end_date_str, '%Y-%m-%d') + timedelta(days=1)).isoformat() + 'Z'
@@ -42,45 +97,57 @@ def fetch_tweets(user_id, start_date_str, end_date_str):
         'max_results': 100  # Number of tweets to fetch per request (adjust as needed)
     }
 
-    response = requests.get(url, headers=headers, params=params)
+    # Skip tweets already held for this account
+    since_id = index.newest_id(game) if index is not None else None
+    if since_id is not None:
+        params['since_id'] = since_id
+
+    response = http.get(url, headers=headers, params=params)
     response.raise_for_status()  # Check for HTTP errors
 
     tweets = response.json().get('data', [])
     
-    # Initialize list to store tweet data
-    data = []
+    # Append tweets straight into columnar buffers
+    records = TweetRecordBuilder(TIMELINE_SCHEMA, capacity=max(len(tweets), 1))
 
     for tweet in tweets:
-        created_at = tweet['created_at']
         public_metrics = tweet['public_metrics']
-        data.append({
-            'tweet_id': tweet['id'],
-            'date': created_at.split('T')[0],  # Extract date in YYYY-MM-DD format
-            'content': tweet['text'],
-            'likes': public_metrics['like_count'],
-            'retweets': public_metrics['retweet_count']
-        })
-
-    return data
-
-def main(username, start_date_str, end_date_str):
+        records.append(
+            tweet['id'],
+            tweet['created_at'][:10],  # Extract date in YYYY-MM-DD format
+            tweet['text'],
+            public_metrics['like_count'],
+            public_metrics['retweet_count']
+        )
+        if index is not None:
+            index.add(
+                game, tweet['id'], tweet['created_at'], text=tweet['text'],
+                retweet_count=public_metrics['retweet_count'], like_count=public_metrics['like_count']
+            )
+
+    if index is not None:
+        index.commit()
+
+    return records.to_dataframe()
+
+def main(username, start_date_str, end_date_str, index=None, user_id=None):
     """Main function to fetch and save tweets for given username and date range"""
-    # Get the user ID from the username
-    user_id = get_user_id(username)
-
-    # Fetch tweet data
-    tweet_data = fetch_tweets(user_id, start_date_str, end_date_str)
-
-    # Convert the data to a DataFrame
-    df = pd.DataFrame(tweet_data)
-
-    # Save the DataFrame to a CSV file
-    csv_filename = f'{username}_{start_date_str}_to_{end_date_str}.csv'
-    df.to_csv(csv_filename, index=False)
-    print(f'Saved tweet data to {csv_filename}')
-
-    # Aggregate data by date
-    aggregated_data = df.groupby('date').agg(
+    # Get the user ID from the username unless it was resolved up front
+    if user_id is None:
+        user_id = get_user_id(username)
+
+    # Fetch tweet data as a DataFrame
+    df = fetch_tweets(user_id, start_date_str, end_date_str, index=index, game=username)
+
+    # Append the raw tweets to the archive, partitioned by day
+    write_archive(df, 'twitter_timeline', username, 'date')
+
+    # Aggregate the whole date range from the archive, so tweets collected by earlier runs count too
+    archived = read_archive(
+        'twitter_timeline', games=[username], start_date=start_date_str, end_date=end_date_str,
+        columns=['tweet_id', 'likes', 'retweets'], unique_key=['tweet_id']
+    )
+    aggregated_data = archived.groupby('date').agg(
         Tweet_Count=('tweet_id', 'count'),
         Likes=('likes', 'sum'),
         Retweets=('retweets', 'sum')
@@ -97,9 +164,18 @@ if __name__ == "__main__":
     # Load the list of games from gamelist.csv
     games_df = pd.read_csv('gamelist.csv')
 
+    # Shared index so tweets already collected are not stored again
+    index = TweetIndex()
+
+    # Resolve every account in one batched, cached lookup
+    user_ids = resolve_user_ids(games_df['Game Name'].tolist())
+
     # Loop through each game in the gamelist
-    for index, row in games_df.iterrows():
+    for _, row in games_df.iterrows():
         game_name = row['Game Name']
+        if game_name not in user_ids:
+            print(f'Skipping {game_name}: user ID could not be resolved')
+            continue
         print(f'Fetching tweets for {game_name}')
 
         # Replace with the desired start and end dates for each game
@@ -107,4 +183,6 @@ if __name__ == "__main__":
         end_date_str = '2024-09-09'
         
         # Run the main function for each game
-        main(game_name, start_date_str, end_date_str)
+        main(game_name, start_date_str, end_date_str, index=index, user_id=user_ids[game_name])
+
+    index.close()
@@ -0,0 +1,146 @@
+"""Standard library imports."""
+import hashlib
+import math
+import sqlite3
+
+# Default location of the persistent tweet index (scripts run from the repo root)
+DEFAULT_INDEX_PATH = 'twitter/tweet_index.sqlite'
+
+
+class BloomFilter:
+    """
+    In-memory Bloom filter over tweet ids.
+
+    Answers "definitely not seen" without touching SQLite, so the common case
+    of a brand-new tweet costs a few bit lookups.
+
+    Args:
+        capacity (int): Expected number of ids.
+        error_rate (float): Target false-positive rate at ``capacity`` ids.
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        self.capacity = max(int(capacity), 1)
+        self.error_rate = error_rate
+        self.size = int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)) + 1
+        self.hash_count = max(int(self.size / self.capacity * math.log(2)), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        """Yield bit positions for an item using double hashing."""
+        digest = hashlib.blake2b(str(item).encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item):
+        """Add an item to the filter."""
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class TweetIndex:
+    """
+    Persistent index of every tweet collected so far, shared by all collectors.
+
+    Each tweet is stored once in ``tweets``; the games (search terms or
+    accounts) it was collected for live in the many-to-many ``tweet_games``
+    table. A Bloom filter sits in front of the id lookups.
+
+    Args:
+        path (str): Path to the SQLite database file.
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS tweets (
+                id INTEGER PRIMARY KEY,
+                created_at TEXT,
+                author_id INTEGER,
+                text TEXT,
+                retweet_count INTEGER,
+                like_count INTEGER,
+                lang TEXT
+            );
+            CREATE TABLE IF NOT EXISTS tweet_games (
+                tweet_id INTEGER NOT NULL REFERENCES tweets(id),
+                game TEXT NOT NULL,
+                PRIMARY KEY (game, tweet_id)
+            ) WITHOUT ROWID;
+        """)
+        self._load_bloom()
+
+    def _load_bloom(self, min_capacity=0):
+        """(Re)build the Bloom filter from the ids already stored."""
+        (stored,) = self.conn.execute("SELECT COUNT(*) FROM tweets").fetchone()
+        self.bloom = BloomFilter(max(stored * 2, min_capacity, 100_000))
+        for (tweet_id,) in self.conn.execute("SELECT id FROM tweets"):
+            self.bloom.add(tweet_id)
+
+    def __contains__(self, tweet_id):
+        tweet_id = int(tweet_id)
+        if tweet_id not in self.bloom:
+            return False
+        row = self.conn.execute("SELECT 1 FROM tweets WHERE id = ?", (tweet_id,)).fetchone()
+        return row is not None
+
+    def newest_id(self, game=None):
+        """
+        Return the newest tweet id already held, for use as ``since_id``.
+
+        Args:
+            game (str): Restrict to tweets collected for this game; all tweets if None.
+
+        Returns:
+            int or None: Highest stored tweet id, or None if nothing is stored yet.
+        """
+        if game is None:
+            row = self.conn.execute("SELECT MAX(id) FROM tweets").fetchone()
+        else:
+            row = self.conn.execute("SELECT MAX(tweet_id) FROM tweet_games WHERE game = ?", (game,)).fetchone()
+        return row[0]
+
+    def add(self, game, tweet_id, created_at=None, author_id=None, text=None,
+            retweet_count=0, like_count=0, lang=None):
+        """
+        Record a tweet for a game, storing the tweet itself only if it is new.
+
+        Args:
+            game (str): Game the tweet was collected for.
+            tweet_id (int): Tweet id.
+            created_at, author_id, text, retweet_count, like_count, lang: Tweet fields.
+
+        Returns:
+            bool: True if the tweet was not in the index before.
+        """
+        tweet_id = int(tweet_id)
+        is_new = tweet_id not in self
+        if is_new:
+            self.conn.execute(
+                "INSERT INTO tweets VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (tweet_id, str(created_at) if created_at is not None else None,
+                 int(author_id) if author_id is not None else None,
+                 text, retweet_count, like_count, lang)
+            )
+            self.bloom.add(tweet_id)
+            if self.bloom.count > self.bloom.capacity:
+                self._load_bloom(self.bloom.capacity * 2)
+        self.conn.execute("INSERT OR IGNORE INTO tweet_games VALUES (?, ?)", (tweet_id, game))
+        return is_new
+
+    def commit(self):
+        """Flush pending writes to disk."""
+        self.conn.commit()
+
+    def close(self):
+        """Commit and close the underlying database."""
+        self.conn.commit()
+        self.conn.close()
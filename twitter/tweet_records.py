@@ -0,0 +1,131 @@
+"""Third-party imports."""
+import numpy as np
+import pandas as pd
+
+# Sentinel stored in int64 datetime buffers for missing timestamps
+_NAT = np.iinfo(np.int64).min
+
+
+class TweetRecordBuilder:
+    """
+    Columnar, append-only buffer for tweet records.
+
+    Each column is backed by a preallocated NumPy array that doubles in size
+    when full, so appending a tweet writes a handful of scalars instead of
+    allocating a list or dict per row. Columns declared as ``category`` are
+    interned: every distinct value is stored once and rows hold an int32 code.
+
+    Supported column kinds:
+        ``int``      - int64 values (missing values are stored as 0).
+        ``datetime`` - timestamps stored as int64 nanoseconds since epoch (UTC).
+        ``category`` - interned values (language, author id, day, ...).
+        ``object``   - arbitrary Python objects (text, geo payloads).
+
+    Args:
+        schema (dict): Mapping of column name to column kind, in output order.
+        capacity (int): Number of rows to preallocate.
+    """
+
+    def __init__(self, schema, capacity=1024):
+        self.schema = dict(schema)
+        self._size = 0
+        self._capacity = max(int(capacity), 1)
+        self._buffers = {}
+        self._categories = {}
+        for name, kind in self.schema.items():
+            self._buffers[name] = self._allocate(kind, self._capacity)
+            if kind == "category":
+                self._categories[name] = {}
+        self._columns = list(self.schema.items())
+
+    @staticmethod
+    def _allocate(kind, capacity):
+        """Allocate an empty buffer for a column of the given kind."""
+        if kind == "int":
+            return np.zeros(capacity, dtype=np.int64)
+        if kind == "datetime":
+            return np.full(capacity, _NAT, dtype=np.int64)
+        if kind == "category":
+            return np.full(capacity, -1, dtype=np.int32)
+        if kind == "object":
+            return np.empty(capacity, dtype=object)
+        raise ValueError(f"Unknown column kind '{kind}'.")
+
+    def __len__(self):
+        return self._size
+
+    def _grow(self):
+        """Double the capacity of every column buffer."""
+        new_capacity = self._capacity * 2
+        for name, kind in self._columns:
+            old = self._buffers[name]
+            new = self._allocate(kind, new_capacity)
+            new[:self._size] = old[:self._size]
+            self._buffers[name] = new
+        self._capacity = new_capacity
+
+    def append(self, *values):
+        """
+        Append one record, with values given in schema order.
+
+        Args:
+            *values: One value per column.
+        """
+        if len(values) != len(self._columns):
+            raise ValueError(f"Expected {len(self._columns)} values, got {len(values)}.")
+        if self._size == self._capacity:
+            self._grow()
+
+        row = self._size
+        for (name, kind), value in zip(self._columns, values):
+            if kind == "category":
+                if value is not None:
+                    codes = self._categories[name]
+                    code = codes.get(value)
+                    if code is None:
+                        code = codes[value] = len(codes)
+                    self._buffers[name][row] = code
+            elif kind == "datetime":
+                if value is not None:
+                    self._buffers[name][row] = pd.Timestamp(value).value
+            elif kind == "int":
+                self._buffers[name][row] = value or 0
+            else:
+                self._buffers[name][row] = value
+        self._size += 1
+
+    def to_dataframe(self):
+        """
+        Hand the buffered records off as a DataFrame.
+
+        Numeric and datetime columns are views over the filled part of the
+        buffers and category columns are built straight from their codes, so
+        no per-row Python objects are created.
+
+        Returns:
+            pd.DataFrame: One row per appended record, columns in schema order.
+        """
+        n = self._size
+        columns = {}
+        for name, kind in self._columns:
+            values = self._buffers[name][:n]
+            if kind == "datetime":
+                columns[name] = pd.Series(values.view("M8[ns]"), copy=False).dt.tz_localize("UTC")
+            elif kind == "category":
+                columns[name] = pd.Categorical.from_codes(values, list(self._categories[name]))
+            else:
+                columns[name] = values
+        return pd.DataFrame(columns, columns=list(self.schema), copy=False)
+
+    def to_parquet(self, path, **kwargs):
+        """
+        Write the buffered records to a Parquet file.
+
+        Category columns are written as Arrow dictionary arrays, keeping the
+        interned values deduplicated on disk.
+
+        Args:
+            path (str): Output file path.
+            **kwargs: Extra arguments passed to ``DataFrame.to_parquet``.
+        """
+        self.to_dataframe().to_parquet(path, index=False, **kwargs)
@@ -1,15 +1,65 @@
 """Third-party imports."""
+import argparse
+import json
+from datetime import datetime, timedelta, timezone
 import tweepy
 import configparser
 import pandas as pd
-import time
+import requests
 from dotenv import load_dotenv
 import os
+from twitter.query_packing import MAX_QUERY_LENGTH, GameMatcher, game_query_term, pack_queries
+from twitter.reach_sketch import ReachStore, export_reach_csv
+from twitter.tweet_index import TweetIndex
+from twitter.tweet_records import TweetRecordBuilder
+from http_client import client as http
+from raw_archive import write_archive
 
 # Load environment variables
 load_dotenv()
 BEARER_TOKEN = os.getenv('BEARER_TOKEN')
 
+# Column layout of the per-game tweet records
+TWEET_SCHEMA = {
+    "Tweet ID": "int",
+    "Time": "datetime",
+    "User": "category",  # author ids repeat across tweets, so they are interned
+    "Tweet": "object",
+    "Coordinates": "object",
+    "Retweet Count": "int",
+    "Likes Count": "int",
+    "Language": "category",
+}
+
+# Recent search covers the last 7 days and rejects a since_id from before that window;
+# the margin keeps an id from aging out between the check and the request
+SINCE_ID_MAX_AGE = timedelta(days=7) - timedelta(hours=1)
+
+# Twitter snowflake ids carry their creation time in ms since this epoch, above 22 bits
+SNOWFLAKE_EPOCH_MS = 1288834974657
+
+def snowflake_time(tweet_id):
+    """Return the creation time encoded in a tweet id."""
+    return datetime.fromtimestamp(((int(tweet_id) >> 22) + SNOWFLAKE_EPOCH_MS) / 1000, tz=timezone.utc)
+
+def search_since_id(index, game):
+    """
+    Return the newest tweet id held for a game, if recent search accepts it as ``since_id``.
+
+    Args:
+        index (TweetIndex): Shared tweet index, or None.
+        game (str): The game to look up.
+
+    Returns:
+        int or None: The id, or None if there is no index, nothing is held for
+        the game, or the newest tweet is older than the search window (the
+        whole window is then searched).
+    """
+    since_id = index.newest_id(game) if index is not None else None
+    if since_id is None or datetime.now(timezone.utc) - snowflake_time(since_id) > SINCE_ID_MAX_AGE:
+        return None
+    return since_id
+
 def authenticate_twitter(bearer_token):
     """
     Authenticate with Twitter using a bearer token.
@@ -20,7 +70,10 @@ def authenticate_twitter(bearer_token):
     Returns:
         tweepy.Client: Authenticated Twitter API client.
     """
-    return tweepy.Client(bearer_token=bearer_token, wait_on_rate_limit=True)
+    # Rate limits are handled by the shared HTTP client, which also provides the pooled session
+    twitter_client = tweepy.Client(bearer_token=bearer_token, wait_on_rate_limit=False)
+    twitter_client.session = http.session
+    return twitter_client
 
 def load_game_list(file_path):
     """
@@ -35,62 +88,243 @@ def load_game_list(file_path):
     game_df = pd.read_csv(file_path)
     return game_df['game'].tolist()
 
-def search_tweets(client, game, limit=10000, max_retries=3, retry_delay=5):
+def iter_search_results(client, query, limit, max_retries=3, retry_delay=5, **search_kwargs):
+    """
+    Yield tweets matching a search query, retrying each page request on its own.
+    
+    Args:
+        client (tweepy.Client): Authenticated Twitter API client.
+        query (str): Search query.
+        limit (int): Maximum number of tweets to yield.
+        max_retries (int): Maximum number of retries per page request.
+        retry_delay (int): Base delay of the exponential backoff in seconds.
+        **search_kwargs: Extra arguments for ``search_recent_tweets``.
+    
+    Yields:
+        tweepy.Tweet: Matching tweets, newest first. Iteration stops early if a
+        page still fails after its retries.
+    """
+    remaining = limit
+    while remaining > 0:
+        try:
+            response = http.call(
+                client.search_recent_tweets, kwargs=dict(query=query, max_results=100, **search_kwargs),
+                host="api.twitter.com", max_retries=max_retries, backoff_base=retry_delay
+            )
+        except (tweepy.TweepyException, requests.exceptions.RequestException) as e:
+            # Keep the tweets already retrieved; only the remaining pages are lost
+            print(f"An error occurred: {str(e)}. Stopped after {limit - remaining} tweets for '{query}'.")
+            return
+        tweets = (response.data or [])[:remaining]
+        yield from tweets
+        remaining -= len(tweets)
+
+        next_token = response.meta.get("next_token")
+        if not next_token:
+            break
+        search_kwargs["next_token"] = next_token
+
+def archive_tweets(df, game):
+    """
+    Append tweets to the raw Parquet archive, partitioned by tweet day.
+
+    With a tweet index, each tweet is archived once, under the first game it
+    was collected for; the index's ``tweet_games`` table maps it to every game.
+    
+    Args:
+        df (pd.DataFrame): Tweets in TWEET_SCHEMA layout.
+        game (str): The game the tweets were first collected for.
     """
-    Search tweets about a specific game and save results to a CSV file.
+    # Geo payloads are free-form dicts, so they are stored as JSON text
+    coordinates = df["Coordinates"].map(lambda geo: json.dumps(geo) if geo else None)
+    # Author ids are archived as interned strings, matching the archive's fixed schema
+    users = df["User"].cat.rename_categories(str)
+    write_archive(df.assign(Coordinates=coordinates, User=users), "twitter", game, "Time")
+
+def search_tweets(client, game, limit=10000, max_retries=3, retry_delay=5, index=None, reach=None):
+    """
+    Search tweets about a specific game and append the results to the raw archive.
+
+    When a tweet index is given, the search resumes from the newest tweet
+    already held for the game and every tweet is recorded in the index,
+    which stores tweets mentioning several games only once. Only tweets new
+    to the index are archived.
     
     Args:
         client (tweepy.Client): Authenticated Twitter API client.
         game (str): The game name or hashtag to search for.
         limit (int): Maximum number of tweets to retrieve.
-        max_retries (int): Maximum number of retries for request failures.
-        retry_delay (int): Delay between retries in seconds.
+        max_retries (int): Maximum number of retries per page request.
+        retry_delay (int): Base delay of the exponential backoff in seconds.
+        index (TweetIndex): Optional shared tweet index to deduplicate against.
+        reach (ReachStore): Optional unique-author sketches to update per tweet day.
     
     Returns:
         pd.DataFrame: DataFrame containing retrieved tweet information.
     """
-    columns = ["Time", "User", "Tweet", "Coordinates", "User Data", "Retweet Count", "Likes Count", "Language"]
-    data = []
+    records = TweetRecordBuilder(TWEET_SCHEMA, capacity=min(limit, 1024))
 
-    retries_left = max_retries
-    while retries_left > 0:
-        try:
-            tweets = tweepy.Paginator(
-                client.search_recent_tweets, query=f"#{game}", max_results=100,
-                tweet_fields=["created_at", "text", "lang", "public_metrics", "geo"], 
-                user_fields=["username"]
-            ).flatten(limit=limit)
-            break  # Exit the loop if tweets are retrieved successfully
-        except tweepy.TweepyException as e:
-            print(f"An error occurred: {str(e)}. Retrying in {retry_delay} seconds...")
-            retries_left -= 1
-            time.sleep(retry_delay)
-    else:
-        print(f"Failed to retrieve tweets for '{game}' after {max_retries} retries.")
-        return pd.DataFrame(columns=columns)
+    search_kwargs = {}
+    since_id = search_since_id(index, game)
+    if since_id is not None:
+        search_kwargs["since_id"] = since_id
+
+    tweets = iter_search_results(
+        client, game_query_term(game), limit, max_retries, retry_delay,
+        tweet_fields=["created_at", "text", "lang", "public_metrics", "geo", "author_id"],
+        user_fields=["username"], **search_kwargs
+    )
 
+    new_rows = []  # rows of tweets not archived before
     for tweet in tweets:
-        likes_count = tweet.public_metrics.get("like_count", 0)
-        retweet_count = tweet.public_metrics.get("retweet_count", 0)
-        
-        data.append([
+        public_metrics = tweet.public_metrics
+        retweet_count = public_metrics.get("retweet_count", 0)
+        likes_count = public_metrics.get("like_count", 0)
+        row = len(records)
+        records.append(
+            tweet.id,
             tweet.created_at,
             tweet.author_id,  # User ID as user details are limited with bearer token
             tweet.text,
             tweet.geo,
-            None,  # Placeholder for unavailable user data
             retweet_count,
             likes_count,
             tweet.lang
-        ])
+        )
+        if index is None or index.add(
+            game, tweet.id, tweet.created_at, tweet.author_id, tweet.text,
+            retweet_count, likes_count, tweet.lang
+        ):
+            new_rows.append(row)
+        if reach is not None:
+            reach.add(game, tweet.created_at.date().isoformat(), tweet.author_id)
 
-    df = pd.DataFrame(data, columns=columns)
-    output_file = f"{game}_Tweets.csv"
-    df.to_csv(output_file, index=False)
-    print(f"Data saved to {output_file}")
+    if index is not None:
+        index.commit()
+        print(f"{len(new_rows)} of {len(records)} tweets for '{game}' were not indexed before")
+
+    df = records.to_dataframe()
+    archive_tweets(df.iloc[new_rows].reset_index(drop=True), game)
     return df
 
+def search_tweets_packed(client, games, limit=10000, max_retries=3, retry_delay=5, index=None,
+                         max_query_length=MAX_QUERY_LENGTH, reach=None):
+    """
+    Search tweets for many games with OR-combined queries and archive them.
+
+    Games are packed into as few queries as fit under the query-length limit.
+    Each returned tweet is attributed locally to every game whose hashtag or
+    handle appears in its text or entities. With a tweet index, a tweet is
+    archived once, under the first game it matches, and only if it is new
+    to the index. Games are resumed from their own newest tweet: games with
+    one are packed together in id order, games without one apart from them.
+
+    Args:
+        client (tweepy.Client): Authenticated Twitter API client.
+        games (list): Game names or handles to search for.
+        limit (int): Maximum number of tweets to retrieve per game; a packed
+            query may retrieve ``limit`` tweets for each game it combines.
+        max_retries (int): Maximum number of retries per page request.
+        retry_delay (int): Base delay of the exponential backoff in seconds.
+        index (TweetIndex): Optional shared tweet index to deduplicate against.
+        max_query_length (int): Maximum length of a single search query.
+        reach (ReachStore): Optional unique-author sketches to update per tweet day.
+
+    Returns:
+        dict: Mapping of game to DataFrame of its tweets.
+    """
+    matcher = GameMatcher(games)
+    results = {}
+
+    # Read every game's since_id before any pack runs: attributing a tweet to a game
+    # in a later pack raises its newest id, which would make that pack skip tweets
+    since_ids = {game: search_since_id(index, game) for game in games}
+
+    # Games without a since_id are packed apart so they do not make every pack search
+    # the whole window; the rest are packed in id order, keeping each pack's minimum
+    # close to its members' own ids
+    fresh = [game for game in games if since_ids[game] is None]
+    resumed = sorted((game for game in games if since_ids[game] is not None), key=since_ids.get)
+    packs = pack_queries(fresh, max_query_length) + pack_queries(resumed, max_query_length)
+
+    for query, pack in packs:
+        # Results come newest first, so a per-query cap would let busy games crowd out quiet ones
+        pack_limit = limit * len(pack)
+        records = TweetRecordBuilder(TWEET_SCHEMA, capacity=min(pack_limit, 1024))
+        rows_by_game = {game: [] for game in pack}
+        new_rows_by_game = {}  # rows of tweets not archived before, by first matched game
+
+        # Resume from the oldest "newest id" of the pack so no game misses tweets
+        search_kwargs = {}
+        if since_ids[pack[0]] is not None:
+            search_kwargs["since_id"] = min(since_ids[game] for game in pack)
+
+        tweets = iter_search_results(
+            client, query, pack_limit, max_retries, retry_delay,
+            tweet_fields=["created_at", "text", "lang", "public_metrics", "geo", "author_id", "entities"],
+            user_fields=["username"], **search_kwargs
+        )
+
+        unmatched = 0
+        for tweet in tweets:
+            matched = matcher.match_tweet(tweet.text, tweet.entities)
+            if not matched:
+                unmatched += 1
+                continue
+
+            public_metrics = tweet.public_metrics
+            retweet_count = public_metrics.get("retweet_count", 0)
+            likes_count = public_metrics.get("like_count", 0)
+            row = len(records)
+            records.append(
+                tweet.id,
+                tweet.created_at,
+                tweet.author_id,
+                tweet.text,
+                tweet.geo,
+                retweet_count,
+                likes_count,
+                tweet.lang
+            )
+            matched = sorted(matched)
+            is_new = index is None
+            for game in matched:
+                rows_by_game.setdefault(game, []).append(row)
+                if index is not None:
+                    # Only the first game of a new tweet stores it; later games just map to it
+                    is_new |= index.add(
+                        game, tweet.id, tweet.created_at, tweet.author_id, tweet.text,
+                        retweet_count, likes_count, tweet.lang
+                    )
+                if reach is not None:
+                    reach.add(game, tweet.created_at.date().isoformat(), tweet.author_id)
+            if is_new:
+                new_rows_by_game.setdefault(matched[0], []).append(row)
+
+        if index is not None:
+            index.commit()
+        if unmatched:
+            print(f"{unmatched} tweets could not be attributed to any game")
+
+        df = records.to_dataframe()
+        for game, rows in new_rows_by_game.items():
+            archive_tweets(df.iloc[rows].reset_index(drop=True), game)
+        for game, rows in rows_by_game.items():
+            game_df = df.iloc[rows].reset_index(drop=True)
+            # A game can also match tweets returned for other packs, possibly the same ones
+            if game in results:
+                game_df = pd.concat([results[game], game_df], ignore_index=True)
+                game_df = game_df.drop_duplicates(subset="Tweet ID", ignore_index=True)
+            results[game] = game_df
+
+    return results
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Collect tweets for every game in the game list.")
+    parser.add_argument("--pack", action="store_true",
+                        help="combine many games into each search request with OR queries")
+    args = parser.parse_args()
+
     # Authenticate Twitter API using bearer token
     client = authenticate_twitter(BEARER_TOKEN)
 
@@ -98,7 +332,22 @@ if __name__ == "__main__":
     games_file = 'twitter/game_list.csv'
     game_list = load_game_list(games_file)
 
-    # Loop through each game and retrieve tweets
-    for game in game_list:
-        print(f"Searching tweets for '{game}'")
-        search_tweets(client, game)
+    # Shared index so tweets mentioning several games are stored once
+    index = TweetIndex()
+
+    # Unique-author sketches per game and day, stored alongside the index
+    reach = ReachStore(index.conn)
+
+    if args.pack:
+        # Search many games per request and attribute tweets locally
+        search_tweets_packed(client, game_list, index=index, reach=reach)
+    else:
+        # Loop through each game and retrieve tweets
+        for game in game_list:
+            print(f"Searching tweets for '{game}'")
+            search_tweets(client, game, index=index, reach=reach)
+
+    # Persist the sketches and refresh the dashboard's unique reach figures
+    reach.flush()
+    export_reach_csv(reach, game_list)
+    index.close()
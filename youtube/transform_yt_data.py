@@ -1,29 +1,33 @@
-import os
-import glob
+from datetime import datetime, timedelta
 import pandas as pd
+from raw_archive import read_archive
 
-def load_csv_files():
-    """
-    Load all CSV files from the current directory, add a 'Game' column for each,
-    and return a concatenated DataFrame.
-    
-    Returns:
-        pd.DataFrame: Concatenated DataFrame of all CSV files with 'Game' column.
+# Number of days covered by a Share of Voice run
+SOV_DAYS = 7
+
+# Columns the transform needs from the archived video rows
+ARCHIVE_COLUMNS = ["Video ID", "Published Date", "View Count", "Like Count", "Comment Count", "Subscriber Count"]
+
+def load_archive(days=SOV_DAYS, games=None):
     """
-    csv_files = glob.glob('*.csv')
-    dataframes = []
+    Load the last `days` days of YouTube video data from the raw archive.
 
-    for csv_file in csv_files:
-        try:
-            df = pd.read_csv(csv_file, index_col=0)
-            # Use the file name to set the 'Game' column
-            df["Game"] = os.path.basename(csv_file).split(' ')[0]
-            dataframes.append(df)
-        except Exception as e:
-            print(f"Error loading {csv_file}: {e}")
-            continue
+    Only the matching date partitions and the columns used by the transform
+    are read, and re-collected videos keep their latest statistics.
 
-    return pd.concat(dataframes, ignore_index=True)
+    Args:
+        days (int): Number of days of publish dates to load.
+        games (list): Games to load; all archived games if None.
+
+    Returns:
+        pd.DataFrame: Video rows with a 'Game' column.
+    """
+    start_date = (datetime.utcnow() - timedelta(days=days)).strftime("%Y-%m-%d")
+    df = read_archive(
+        "youtube", games=games, start_date=start_date,
+        columns=ARCHIVE_COLUMNS, unique_key=["game", "Video ID"]
+    )
+    return df.rename(columns={"game": "Game"}).set_index("Video ID")
 
 
 def preprocess_dataframe(df):
@@ -107,8 +111,8 @@ def export_top_n_with_other(df, metric, n=9):
 
 
 def main():
-    # Load and preprocess data
-    raw_data = load_csv_files()
+    # Load and preprocess the last SOV_DAYS days of archived data
+    raw_data = load_archive()
     filtered_data = preprocess_dataframe(raw_data)
     
     # Save specific game data to CSV
@@ -1,10 +1,13 @@
 """Third Party Imports."""
 import os
-import time
-import requests
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
+from http_client import client as http
+from raw_archive import write_archive
 
 # Load environment variables
 load_dotenv()
@@ -15,6 +18,56 @@ now = datetime.utcnow()
 days_ago = now - timedelta(days=7)
 days_ago_str = days_ago.strftime("%Y-%m-%dT%H:%M:%SZ")
 
+# Maximum number of IDs accepted by one videos request
+STATS_BATCH_SIZE = 50
+
+# Column layout of the collected video rows
+VIDEO_COLUMNS = [
+    "Video ID",
+    "Published Date",
+    "Title",
+    "View Count",
+    "Like Count",
+    "Comment Count",
+    "Channel Title",
+    "Subscriber Count",
+]
+
+# Statistics arrive from the API as strings
+NUMERIC_COLUMNS = ["View Count", "Like Count", "Comment Count", "Subscriber Count"]
+
+
+def search_page(search_query, page_token=None, max_results=50, max_retries=3, retry_delay=5):
+    """
+    Fetch one page of search results for a given search query.
+
+    Args:
+        search_query (str): The game name or search term.
+        page_token (str): Token of the page to fetch, or None for the first page.
+        max_results (int): Maximum number of results per page.
+        max_retries (int): Maximum attempts on request failure.
+        retry_delay (int): Base delay of the exponential backoff in seconds.
+
+    Returns:
+        tuple: (list of video IDs, next page token), or (None, None) if the request failed.
+    """
+    search_url = (
+        f"https://www.googleapis.com/youtube/v3/search?part=snippet"
+        f"&q=allintitle%3A{search_query}&type=video&maxResults={max_results}"
+        f"&key={API_KEY}&publishedAfter={days_ago_str}"
+    )
+    if page_token:
+        search_url += f"&pageToken={page_token}"
+
+    response = http.get(search_url, max_retries=max_retries - 1, backoff_base=retry_delay)
+    if response.status_code != 200:
+        print(f"Failed to retrieve data for '{search_query}': error {response.status_code}.")
+        return None, None
+
+    data = response.json()
+    video_ids = [item["id"]["videoId"] for item in data.get("items", [])]
+    return video_ids, data.get("nextPageToken")
+
 
 def extract_video_data(search_query, max_results=50, max_retries=3, retry_delay=5):
     """
@@ -33,75 +86,143 @@ def extract_video_data(search_query, max_results=50, max_retries=3, retry_delay=
     next_page_token = None
 
     while True:
-        search_url = (
-            f"https://www.googleapis.com/youtube/v3/search?part=snippet"
-            f"&q=allintitle%3A{search_query}&type=video&maxResults={max_results}"
-            f"&key={API_KEY}&publishedAfter={days_ago_str}"
+        page_ids, next_page_token = search_page(
+            search_query, next_page_token, max_results, max_retries, retry_delay
         )
-        if next_page_token:
-            search_url += f"&pageToken={next_page_token}"
-
-        for _ in range(max_retries):
-            response = requests.get(search_url)
-            if response.status_code == 200:
-                break
-            print(f"Error {response.status_code}: Retrying in {retry_delay} seconds...")
-            time.sleep(retry_delay)
-        else:
-            print(f"Failed to retrieve data for '{search_query}' after {max_retries} retries.")
+        if page_ids is None:
             return []
 
-        video_ids.extend(item["id"]["videoId"] for item in response.json().get("items", []))
-        next_page_token = response.json().get("nextPageToken")
+        video_ids.extend(page_ids)
         if not next_page_token:
             break
 
     return video_ids
 
 
+def fetch_video_stats(batch, max_retries=3, retry_delay=5):
+    """
+    Fetch snippet and statistics for one batch of up to 50 video IDs.
+
+    Args:
+        batch (list): Video IDs to look up.
+        max_retries (int): Maximum attempts on request failure.
+        retry_delay (int): Base delay of the exponential backoff in seconds.
+
+    Returns:
+        list: One row per video, or an empty list if the request failed.
+    """
+    stats_url = (
+        f"https://www.googleapis.com/youtube/v3/videos?part=snippet,statistics"
+        f"&id={','.join(batch)}&key={API_KEY}"
+    )
+
+    stats_response = http.get(stats_url, max_retries=max_retries - 1, backoff_base=retry_delay)
+    if stats_response.status_code != 200:
+        print(f"Error {stats_response.status_code}: {stats_response.text}")
+        print(f"Failed to retrieve stats for batch: {batch}")
+        return []
+
+    video_data = []
+    for item in stats_response.json().get("items", []):
+        snippet = item["snippet"]
+        stats = item.get("statistics", {})
+        video_data.append([
+            item["id"],
+            snippet["publishedAt"],
+            snippet["title"],
+            stats.get("viewCount", 0),
+            stats.get("likeCount", 0),
+            stats.get("commentCount", 0),
+            snippet.get("channelTitle", ""),
+            stats.get("subscriberCount", 0)
+        ])
+    return video_data
+
+
 def transform_video_data(video_ids, max_retries=3, retry_delay=5):
     video_data = []
     if not video_ids:
         print("No video IDs found.")
         return video_data
 
-    batch_size = 50
-    for i in range(0, len(video_ids), batch_size):
-        batch = video_ids[i:i + batch_size]
-        stats_url = (
-            f"https://www.googleapis.com/youtube/v3/videos?part=snippet,statistics"
-            f"&id={','.join(batch)}&key={API_KEY}"
-        )
-        
-        for _ in range(max_retries):
-            stats_response = requests.get(stats_url)
-            if stats_response.status_code == 200:
-                stats_data = stats_response.json()
-                for item in stats_data.get("items", []):
-                    video_id = item["id"]
-                    snippet = item["snippet"]
-                    stats = item.get("statistics", {})
-                    video_data.append([
-                        video_id,
-                        snippet["publishedAt"],
-                        snippet["title"],
-                        stats.get("viewCount", 0),
-                        stats.get("likeCount", 0),
-                        stats.get("commentCount", 0),
-                        snippet.get("channelTitle", ""),
-                        stats.get("subscriberCount", 0)
-                    ])
-                break
-            else:
-                print(f"Error {stats_response.status_code}: {stats_response.text}")
-                time.sleep(retry_delay)
-        else:
-            print(f"Failed to retrieve stats for batch: {batch}")
-            continue
+    for i in range(0, len(video_ids), STATS_BATCH_SIZE):
+        batch = video_ids[i:i + STATS_BATCH_SIZE]
+        video_data.extend(fetch_video_stats(batch, max_retries, retry_delay))
 
     return video_data
 
 
+def run_pipeline(game_list, search_workers=4, stats_workers=4, queue_size=32):
+    """
+    Collect video data for many games with overlapping search and stats requests.
+
+    Search pages for different games are fetched in parallel, and the video IDs
+    of every page are pushed onto a bounded queue as soon as they arrive. A pool
+    of stats workers drains the queue in batches of up to 50 IDs, so stats
+    lookups run while later search pages are still being fetched. All requests
+    go through the shared HTTP client, whose adaptive limit decides how many
+    of the workers actually have a request in flight.
+
+    Args:
+        game_list (list): Game names or search terms.
+        search_workers (int): Number of games searched concurrently.
+        stats_workers (int): Number of concurrent stats lookups.
+        queue_size (int): Maximum number of pending ID batches.
+
+    Returns:
+        dict: Mapping of game to its list of video rows.
+    """
+    batches = queue.Queue(maxsize=queue_size)
+    results = {game: [] for game in game_list}
+    results_lock = threading.Lock()
+
+    def search_game(game):
+        print(f"Extracting videos for '{game}'")
+        page_token = None
+        while True:
+            # Pages hold at most 50 results, i.e. exactly one stats batch
+            try:
+                video_ids, page_token = search_page(game, page_token, max_results=STATS_BATCH_SIZE)
+            except Exception as err:
+                # Stop this game only; the other searches and the stats workers carry on
+                print(f"Failed to retrieve data for '{game}': {err}")
+                break
+            if video_ids:
+                batches.put((game, video_ids))
+            if not page_token:
+                break
+
+    def fetch_stats():
+        while True:
+            item = batches.get()
+            if item is None:
+                return
+            game, video_ids = item
+            try:
+                rows = fetch_video_stats(video_ids)
+            except Exception as err:
+                # Any failure only loses this batch; the worker keeps draining the
+                # bounded queue so searches never block on a dead worker
+                print(f"Failed to retrieve stats for '{game}': {err}")
+                continue
+            with results_lock:
+                results[game].extend(rows)
+
+    consumers = [threading.Thread(target=fetch_stats, daemon=True) for _ in range(stats_workers)]
+    for consumer in consumers:
+        consumer.start()
+
+    with ThreadPoolExecutor(max_workers=search_workers) as pool:
+        list(pool.map(search_game, game_list))
+
+    # One stop marker per stats worker once every search has finished
+    for _ in consumers:
+        batches.put(None)
+    for consumer in consumers:
+        consumer.join()
+
+    return results
+
 
 def extract_channel_data(channel_id, max_retries=3, retry_delay=5):
     """
@@ -109,8 +230,8 @@ def extract_channel_data(channel_id, max_retries=3, retry_delay=5):
     
     Args:
         channel_id (str): Channel ID.
-        max_retries (int): Maximum retries for API requests.
-        retry_delay (int): Delay between retries.
+        max_retries (int): Maximum attempts for API requests.
+        retry_delay (int): Base delay of the exponential backoff in seconds.
         
     Returns:
         dict: Dictionary containing channel title and subscriber count.
@@ -120,14 +241,9 @@ def extract_channel_data(channel_id, max_retries=3, retry_delay=5):
         f"&id={channel_id}&key={API_KEY}"
     )
 
-    for _ in range(max_retries):
-        channel_response = requests.get(channel_url)
-        if channel_response.status_code == 200:
-            break
-        print(f"Error {channel_response.status_code}: Retrying channel data in {retry_delay} seconds...")
-        time.sleep(retry_delay)
-    else:
-        print(f"Failed to retrieve channel data after {max_retries} retries.")
+    channel_response = http.get(channel_url, max_retries=max_retries - 1, backoff_base=retry_delay)
+    if channel_response.status_code != 200:
+        print(f"Failed to retrieve channel data: error {channel_response.status_code}.")
         return {}
 
     channel_info = channel_response.json().get("items", [{}])[0]
@@ -137,28 +253,17 @@ def extract_channel_data(channel_id, max_retries=3, retry_delay=5):
     }
 
 
-def load_to_csv(game, data):
+def load_to_archive(game, data):
     """
-    Load transformed data to a CSV file.
+    Append transformed data to the raw archive, partitioned by publish day.
     
     Args:
         game (str): The name of the game or search term.
-        data (list): The data to load into CSV.
+        data (list): The video rows to archive.
     """
-    df = pd.DataFrame(data, columns=[
-        "Video ID",
-        "Published Date",
-        "Title",
-        "View Count",
-        "Like Count",
-        "Comment Count",
-        "Channel Title",
-        "Subscriber Count",
-    ])
-    game_name = game.replace(" ", "_")
-    output_file = f"{game_name}.csv"
-    df.to_csv(output_file, index=False)
-    print(f"Data saved to {output_file}")
+    df = pd.DataFrame(data, columns=VIDEO_COLUMNS)
+    df[NUMERIC_COLUMNS] = df[NUMERIC_COLUMNS].apply(pd.to_numeric, errors="coerce").fillna(0).astype("int64")
+    write_archive(df, "youtube", game, "Published Date")
 
 
 if __name__ == "__main__":
@@ -166,11 +271,10 @@ if __name__ == "__main__":
     game_df = pd.read_csv("youtube\game_list.csv")
     game_list = game_df['game'].tolist()
 
-    for game in game_list:
-        print(f"Extracting videos for '{game}'")
-        video_ids = extract_video_data(game)
-        if video_ids:
-            print(f"Transforming data for '{game}'")
-            video_data = transform_video_data(video_ids)
-            print(f"Loading data for '{game}' into CSV")
-            load_to_csv(game, video_data)
\ No newline at end of file
+    # Search and stats requests for all games overlap in one pipeline
+    video_data_by_game = run_pipeline(game_list)
+
+    for game, video_data in video_data_by_game.items():
+        if video_data:
+            print(f"Loading data for '{game}' into the archive")
+            load_to_archive(game, video_data)